@@ -0,0 +1,49 @@
+"""
+Shared in-process result cache for the Foundry Agent and Azure Search retrieval.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class ResponseCache:
+    """
+    Small LRU cache with a TTL for Foundry and search results.
+
+    Keys are normalized (case-folded, whitespace-collapsed, trailing
+    punctuation stripped) so trivially different phrasings of the same
+    question share an entry.
+    """
+
+    __slots__ = ("_entries", "_maxsize", "_ttl")
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize a query for cache lookup."""
+        return " ".join(text.casefold().split()).rstrip("?.!")
+
+    def get(self, key: tuple) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: tuple, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
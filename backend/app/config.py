@@ -1,14 +1,46 @@
+import json
 import os
 import logging
+from functools import lru_cache
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-# Models known to support Voice Live (per Azure docs)
+_ENV = os.environ
+
+# Shown in place of all but the last four characters of an API key
+_KEY_MASK = "********"
+
+
+def _env_bool(key: str, default: str) -> bool:
+    """Read a "true"/"false" environment flag."""
+    return _ENV.get(key, default).lower() == "true"
+
+
+def _env_int(key: str, default: str) -> int:
+    """Read an integer environment value."""
+    return int(_ENV.get(key, default))
+
+
+def _env_float(key: str, default: str) -> float:
+    """Read a float environment value."""
+    return float(_ENV.get(key, default))
+
+
+def _split_csv(value: str) -> tuple[str, ...]:
+    """Split a comma-separated setting, dropping blanks and whitespace."""
+    return tuple(part.strip() for part in value.split(",") if part.strip())
+
+# Models known to support Voice Live (per Azure docs), loaded from
+# data/voicelive_models.json so the list can be updated without a code change.
 # See: https://learn.microsoft.com/en-us/azure/ai-services/speech-service/regions?tabs=voice-live
-VOICELIVE_COMPATIBLE_MODELS = [
+VOICELIVE_MODELS_FILE = Path(__file__).parent / "data" / "voicelive_models.json"
+
+# Fallback used if the bundled model list is missing or unreadable
+_DEFAULT_VOICELIVE_MODELS = (
     "gpt-4o-realtime-preview",
     "gpt-4o-realtime",
     "gpt-realtime-mini",
@@ -22,144 +54,262 @@ VOICELIVE_COMPATIBLE_MODELS = [
     "gpt-5-mini",
     "gpt-5-nano",
     "gpt-5-chat",
-]
+)
+
+
+@lru_cache(maxsize=1)
+def _load_models() -> frozenset[str]:
+    """Load the Voice Live compatible model list (read once, then cached)."""
+    try:
+        with VOICELIVE_MODELS_FILE.open(encoding="utf-8") as f:
+            return frozenset(json.load(f))
+    except (OSError, ValueError) as e:
+        logger.warning("Could not load %s: %s", VOICELIVE_MODELS_FILE.name, e)
+        return frozenset(_DEFAULT_VOICELIVE_MODELS)
 
 
 class Settings:
-    # Azure VoiceLive
-    VOICELIVE_ENDPOINT: str = os.getenv(
-        "AZURE_VOICELIVE_ENDPOINT", "wss://eastus2.voice.speech.microsoft.com"
+    __slots__ = (
+        "VOICELIVE_ENDPOINT",
+        "VOICELIVE_API_KEY",
+        "VOICELIVE_MODEL",
+        "USE_TOKEN_CREDENTIAL",
+        "AVATAR_CHARACTER",
+        "AVATAR_STYLE",
+        "AVATAR_CUSTOMIZED",
+        "AVATAR_BASE_MODEL",
+        "AVATAR_VIDEO_BITRATE",
+        "AVATAR_VIDEO_CODEC",
+        "VOICE_NAME",
+        "VOICE_MAPPING_EN",
+        "VOICE_MAPPING_ZH",
+        "VOICE_MAPPING_ZH_HK",
+        "VOICE_MAPPING_MS",
+        "VOICE_MAPPING_TA",
+        "INPUT_LANGUAGES",
+        "ASSISTANT_INSTRUCTIONS",
+        "MAX_RESPONSE_TOKENS",
+        "TRANSCRIPTION_MODEL",
+        "PHRASE_LIST",
+        "VAD_THRESHOLD",
+        "VAD_PREFIX_PADDING_MS",
+        "VAD_SILENCE_DURATION_MS",
+        "VAD_REMOVE_FILLER_WORDS",
+        "EOU_THRESHOLD_LEVEL",
+        "EOU_TIMEOUT_MS",
+        "NOISE_REDUCTION_TYPE",
+        "TURN_BASED_MODE",
+        "FOUNDRY_AGENT_ENABLED",
+        "FOUNDRY_ENDPOINT",
+        "FOUNDRY_AGENT_ID",
+        "AZURE_USE_MSI",
+        "AZURE_CLIENT_ID",
+        "FOUNDRY_THREAD_POOL_SIZE",
+        "FOUNDRY_MAX_CONCURRENT_RUNS",
+        "FOUNDRY_CACHE_ENABLED",
+        "FOUNDRY_CACHE_MAX_ENTRIES",
+        "FOUNDRY_CACHE_TTL_SECONDS",
+        "RAG_ENABLED",
+        "AZURE_SEARCH_ENDPOINT",
+        "AZURE_SEARCH_API_KEY",
+        "AZURE_SEARCH_INDEX",
+        "RAG_TOP_K",
+        "voice_mappings",
+        "input_languages_list",
+        "phrase_list",
+        "_log_lines",
     )
-    VOICELIVE_API_KEY: str = os.getenv("AZURE_VOICELIVE_API_KEY", "")
-    VOICELIVE_MODEL: str = os.getenv("VOICELIVE_MODEL", "gpt-4o-realtime-preview")
 
-    # Use token credential instead of API key
-    USE_TOKEN_CREDENTIAL: bool = (
-        os.getenv("USE_TOKEN_CREDENTIAL", "false").lower() == "true"
-    )
+    def __init__(self):
+        # Azure VoiceLive
+        self.VOICELIVE_ENDPOINT: str = _ENV.get(
+            "AZURE_VOICELIVE_ENDPOINT", "wss://eastus2.voice.speech.microsoft.com"
+        )
+        self.VOICELIVE_API_KEY: str = _ENV.get("AZURE_VOICELIVE_API_KEY", "")
+        self.VOICELIVE_MODEL: str = _ENV.get("VOICELIVE_MODEL", "gpt-4o-realtime-preview")
 
-    # Avatar configuration
-    AVATAR_CHARACTER: str = os.getenv("AVATAR_CHARACTER", "Beatriz")
-    AVATAR_STYLE: str = os.getenv("AVATAR_STYLE", "")
-    AVATAR_CUSTOMIZED: bool = os.getenv("AVATAR_CUSTOMIZED", "true").lower() == "true"
-    AVATAR_BASE_MODEL: str = os.getenv(
-        "AVATAR_BASE_MODEL", "vasa-1"
-    )  # Required for photo/custom avatars
-
-    # Video settings
-    AVATAR_VIDEO_BITRATE: int = int(os.getenv("AVATAR_VIDEO_BITRATE", "2000000"))
-    AVATAR_VIDEO_CODEC: str = os.getenv("AVATAR_VIDEO_CODEC", "h264")
-
-    # Voice settings (use multilingual voice for multi-language support)
-    # Options: en-US-AvaMultilingualNeural, en-US-Ava:DragonHDLatestNeural (HD)
-    VOICE_NAME: str = os.getenv("VOICE_NAME", "en-US-Ava:DragonHDLatestNeural")
-
-    # Per-language voice mappings (native voices for each language)
-    # See: https://learn.microsoft.com/azure/ai-services/speech-service/language-support?tabs=tts
-    VOICE_MAPPING_EN: str = os.getenv("VOICE_MAPPING_EN", "en-US-JennyNeural")
-    VOICE_MAPPING_ZH: str = os.getenv("VOICE_MAPPING_ZH", "zh-CN-XiaoxiaoNeural")
-    VOICE_MAPPING_ZH_HK: str = os.getenv("VOICE_MAPPING_ZH_HK", "zh-HK-HiuMaanNeural")
-    VOICE_MAPPING_MS: str = os.getenv("VOICE_MAPPING_MS", "ms-MY-YasminNeural")
-    VOICE_MAPPING_TA: str = os.getenv("VOICE_MAPPING_TA", "ta-IN-PallaviNeural")
-
-    @property
-    def voice_mappings(self) -> dict[str, str]:
-        """Return mapping of language codes to native voice names."""
-        return {
-            "EN": self.VOICE_MAPPING_EN,
-            "ZH": self.VOICE_MAPPING_ZH,
-            "ZH-HK": self.VOICE_MAPPING_ZH_HK,
-            "MS": self.VOICE_MAPPING_MS,
-            "TA": self.VOICE_MAPPING_TA,
-        }
+        # Use token credential instead of API key
+        self.USE_TOKEN_CREDENTIAL: bool = _env_bool("USE_TOKEN_CREDENTIAL", "false")
 
-    # Input language detection (comma-separated for multi-language auto-detection)
-    # Default: Singapore's four official languages + Cantonese
-    # en=English, zh=Mandarin, zh-HK=Cantonese, ms=Malay, ta=Tamil
-    INPUT_LANGUAGES: str = os.getenv("INPUT_LANGUAGES", "en,zh,zh-HK,ms,ta")
+        # Avatar configuration
+        self.AVATAR_CHARACTER: str = _ENV.get("AVATAR_CHARACTER", "Beatriz")
+        self.AVATAR_STYLE: str = _ENV.get("AVATAR_STYLE", "")
+        self.AVATAR_CUSTOMIZED: bool = _env_bool("AVATAR_CUSTOMIZED", "true")
+        self.AVATAR_BASE_MODEL: str = _ENV.get(
+            "AVATAR_BASE_MODEL", "vasa-1"
+        )  # Required for photo/custom avatars
 
-    # Assistant instructions
-    ASSISTANT_INSTRUCTIONS: str = os.getenv(
-        "ASSISTANT_INSTRUCTIONS",
-        "You are a helpful AI voice assistant. "
-        "Keep responses SHORT - maximum 2 sentences. "
-        "Be concise and conversational. Never give long explanations.",
-    )
+        # Video settings
+        self.AVATAR_VIDEO_BITRATE: int = _env_int("AVATAR_VIDEO_BITRATE", "2000000")
+        self.AVATAR_VIDEO_CODEC: str = _ENV.get("AVATAR_VIDEO_CODEC", "h264")
 
-    # Maximum tokens for assistant response (about 2 sentences)
-    MAX_RESPONSE_TOKENS: int = int(os.getenv("MAX_RESPONSE_TOKENS", "100"))
+        # Voice settings (use multilingual voice for multi-language support)
+        # Options: en-US-AvaMultilingualNeural, en-US-Ava:DragonHDLatestNeural (HD)
+        self.VOICE_NAME: str = _ENV.get("VOICE_NAME", "en-US-Ava:DragonHDLatestNeural")
 
-    # Transcription Settings
-    # Models: whisper-1, gpt-4o-transcribe, gpt-4o-mini-transcribe, azure-speech
-    # azure-speech recommended for multilingual (supports Cantonese, phrase lists)
-    TRANSCRIPTION_MODEL: str = os.getenv("TRANSCRIPTION_MODEL", "azure-speech")
+        # Per-language voice mappings (native voices for each language)
+        # See: https://learn.microsoft.com/azure/ai-services/speech-service/language-support?tabs=tts
+        self.VOICE_MAPPING_EN: str = _ENV.get("VOICE_MAPPING_EN", "en-US-JennyNeural")
+        self.VOICE_MAPPING_ZH: str = _ENV.get("VOICE_MAPPING_ZH", "zh-CN-XiaoxiaoNeural")
+        self.VOICE_MAPPING_ZH_HK: str = _ENV.get("VOICE_MAPPING_ZH_HK", "zh-HK-HiuMaanNeural")
+        self.VOICE_MAPPING_MS: str = _ENV.get("VOICE_MAPPING_MS", "ms-MY-YasminNeural")
+        self.VOICE_MAPPING_TA: str = _ENV.get("VOICE_MAPPING_TA", "ta-IN-PallaviNeural")
 
-    # Phrase list for domain-specific terms (comma-separated)
-    # Helps improve recognition of specific words/phrases (only used with azure-speech)
-    PHRASE_LIST: str = os.getenv("PHRASE_LIST", "")
+        # Input language detection (comma-separated for multi-language auto-detection)
+        # Default: Singapore's four official languages + Cantonese
+        # en=English, zh=Mandarin, zh-HK=Cantonese, ms=Malay, ta=Tamil
+        self.INPUT_LANGUAGES: str = _ENV.get("INPUT_LANGUAGES", "en,zh,zh-HK,ms,ta")
 
-    # VAD prefix padding (ms) - audio captured before speech starts
-    # Increase if first words are being missed (default: 400)
-    VAD_PREFIX_PADDING_MS: int = int(os.getenv("VAD_PREFIX_PADDING_MS", "400"))
+        # Assistant instructions
+        self.ASSISTANT_INSTRUCTIONS: str = _ENV.get(
+            "ASSISTANT_INSTRUCTIONS",
+            "You are a helpful AI voice assistant. "
+            "Keep responses SHORT - maximum 2 sentences. "
+            "Be concise and conversational. Never give long explanations.",
+        )
 
-    # Turn-based mode: when true, auto-response is disabled and user must explicitly trigger response
-    # In live voice mode (false), VAD automatically triggers assistant response after user stops speaking
-    TURN_BASED_MODE: bool = os.getenv("TURN_BASED_MODE", "false").lower() == "true"
+        # Maximum tokens for assistant response (about 2 sentences)
+        self.MAX_RESPONSE_TOKENS: int = _env_int("MAX_RESPONSE_TOKENS", "100")
 
-    # Azure AI Foundry Agent Configuration
-    # Enable Foundry Agent for RAG-augmented responses
-    FOUNDRY_AGENT_ENABLED: bool = (
-        os.getenv("FOUNDRY_AGENT_ENABLED", "false").lower() == "true"
-    )
-    # Full AI Foundry project endpoint (required if enabled)
-    # Format: https://<instance>.services.ai.azure.com/api/projects/<project-name>
-    FOUNDRY_ENDPOINT: str = os.getenv("FOUNDRY_ENDPOINT", "")
-    # Pre-created agent ID (required if enabled)
-    FOUNDRY_AGENT_ID: str = os.getenv("FOUNDRY_AGENT_ID", "")
+        # Transcription Settings
+        # Models: whisper-1, gpt-4o-transcribe, gpt-4o-mini-transcribe, azure-speech
+        # azure-speech recommended for multilingual (supports Cantonese, phrase lists)
+        self.TRANSCRIPTION_MODEL: str = _ENV.get("TRANSCRIPTION_MODEL", "azure-speech")
 
-    def validate_and_log(self):
-        """Validate configuration and log important settings."""
-        logger.info("=== Voice Avatar Configuration ===")
-        logger.info(f"  Endpoint: {self.VOICELIVE_ENDPOINT}")
-        logger.info(f"  Model: {self.VOICELIVE_MODEL}")
+        # Phrase list for domain-specific terms (comma-separated)
+        # Helps improve recognition of specific words/phrases (only used with azure-speech)
+        self.PHRASE_LIST: str = _ENV.get("PHRASE_LIST", "")
+
+        # VAD threshold (0.0-1.0) - higher is less sensitive to background noise
+        self.VAD_THRESHOLD: float = _env_float("VAD_THRESHOLD", "0.6")
+
+        # VAD prefix padding (ms) - audio captured before speech starts
+        # Increase if first words are being missed (default: 400)
+        self.VAD_PREFIX_PADDING_MS: int = _env_int("VAD_PREFIX_PADDING_MS", "400")
+
+        # VAD silence duration (ms) before speech is considered ended
+        # (live mode only; turn-based mode always uses 800ms)
+        self.VAD_SILENCE_DURATION_MS: int = _env_int("VAD_SILENCE_DURATION_MS", "500")
+
+        # Drop filler words ("um", "uh") so they don't trigger turns
+        self.VAD_REMOVE_FILLER_WORDS: bool = _env_bool(
+            "VAD_REMOVE_FILLER_WORDS", "false"
+        )
+
+        # Semantic end-of-utterance detection
+        # Threshold level: low, medium, high or default
+        self.EOU_THRESHOLD_LEVEL: str = _ENV.get("EOU_THRESHOLD_LEVEL", "medium")
+        # Max time (ms) to wait for semantic end detection
+        self.EOU_TIMEOUT_MS: int = _env_int("EOU_TIMEOUT_MS", "1000")
+
+        # Input noise reduction: azure_deep_noise_suppression, near_field or far_field
+        self.NOISE_REDUCTION_TYPE: str = _ENV.get(
+            "NOISE_REDUCTION_TYPE", "azure_deep_noise_suppression"
+        )
+
+        # Turn-based mode: when true, auto-response is disabled and user must explicitly trigger response
+        # In live voice mode (false), VAD automatically triggers assistant response after user stops speaking
+        self.TURN_BASED_MODE: bool = _env_bool("TURN_BASED_MODE", "false")
+
+        # Azure AI Foundry Agent Configuration
+        # Enable Foundry Agent for RAG-augmented responses
+        self.FOUNDRY_AGENT_ENABLED: bool = _env_bool("FOUNDRY_AGENT_ENABLED", "false")
+        # Full AI Foundry project endpoint (required if enabled)
+        # Format: https://<instance>.services.ai.azure.com/api/projects/<project-name>
+        self.FOUNDRY_ENDPOINT: str = _ENV.get("FOUNDRY_ENDPOINT", "")
+        # Pre-created agent ID (required if enabled)
+        self.FOUNDRY_AGENT_ID: str = _ENV.get("FOUNDRY_AGENT_ID", "")
+        # Authenticate to Foundry with managed identity instead of DefaultAzureCredential
+        self.AZURE_USE_MSI: bool = _env_bool("AZURE_USE_MSI", "false")
+        # Client ID of a user-assigned managed identity (empty for system-assigned)
+        self.AZURE_CLIENT_ID: str = _ENV.get("AZURE_CLIENT_ID", "")
+        # Number of idle Foundry threads kept warm for process_query
+        self.FOUNDRY_THREAD_POOL_SIZE: int = _env_int("FOUNDRY_THREAD_POOL_SIZE", "4")
+        # Upper bound for the adaptive limit on concurrent agent runs
+        self.FOUNDRY_MAX_CONCURRENT_RUNS: int = _env_int(
+            "FOUNDRY_MAX_CONCURRENT_RUNS", "4"
+        )
+        # Cache agent responses/context for repeated questions (normalized text)
+        self.FOUNDRY_CACHE_ENABLED: bool = _env_bool("FOUNDRY_CACHE_ENABLED", "true")
+        self.FOUNDRY_CACHE_MAX_ENTRIES: int = _env_int("FOUNDRY_CACHE_MAX_ENTRIES", "256")
+        self.FOUNDRY_CACHE_TTL_SECONDS: int = _env_int("FOUNDRY_CACHE_TTL_SECONDS", "600")
+
+        # Azure AI Search retrieval (RAGRetriever)
+        self.RAG_ENABLED: bool = _env_bool("RAG_ENABLED", "false")
+        self.AZURE_SEARCH_ENDPOINT: str = _ENV.get("AZURE_SEARCH_ENDPOINT", "")
+        self.AZURE_SEARCH_API_KEY: str = _ENV.get("AZURE_SEARCH_API_KEY", "")
+        self.AZURE_SEARCH_INDEX: str = _ENV.get("AZURE_SEARCH_INDEX", "")
+        # Number of documents retrieved per query
+        self.RAG_TOP_K: int = _env_int("RAG_TOP_K", "3")
+
+        # Derived values, computed once from the settings above
+        # Per-language voice mappings keyed by detected language code
+        self.voice_mappings: dict[str, str] = {
+            "EN": self.VOICE_MAPPING_EN,
+            "ZH": self.VOICE_MAPPING_ZH,
+            "ZH-HK": self.VOICE_MAPPING_ZH_HK,
+            "MS": self.VOICE_MAPPING_MS,
+            "TA": self.VOICE_MAPPING_TA,
+        }
+        self.input_languages_list: tuple[str, ...] = _split_csv(self.INPUT_LANGUAGES)
+        self.phrase_list: tuple[str, ...] = _split_csv(self.PHRASE_LIST)
+        # Configuration banner, built on first validate_and_log() call
+        self._log_lines: tuple[str, ...] | None = None
+
+    def _build_log_lines(self) -> tuple[str, ...]:
+        """Return the configuration banner lines (formatted once, then reused)."""
+        if self._log_lines is not None:
+            return self._log_lines
+
+        lines = [
+            "=== Voice Avatar Configuration ===",
+            f"  Endpoint: {self.VOICELIVE_ENDPOINT}",
+            f"  Model: {self.VOICELIVE_MODEL}",
+        ]
         # Log avatar type based on configuration
         if self.AVATAR_BASE_MODEL:
-            logger.info(
+            lines.append(
                 f"  Avatar: {self.AVATAR_CHARACTER} (photo-avatar, {self.AVATAR_BASE_MODEL})"
             )
         else:
-            logger.info(
+            lines.append(
                 f"  Avatar: {self.AVATAR_CHARACTER}/{self.AVATAR_STYLE} (video-avatar)"
             )
-        logger.info(f"  Voice: {self.VOICE_NAME}")
-        logger.info(f"  Input languages: {self.INPUT_LANGUAGES}")
-        logger.info(f"  Transcription model: {self.TRANSCRIPTION_MODEL}")
+        lines.append(f"  Voice: {self.VOICE_NAME}")
+        lines.append(f"  Input languages: {', '.join(self.input_languages_list)}")
+        lines.append(f"  Transcription model: {self.TRANSCRIPTION_MODEL}")
         if self.PHRASE_LIST:
-            logger.info(f"  Phrase list: {self.PHRASE_LIST[:50]}...")
-        logger.info(f"  VAD prefix padding: {self.VAD_PREFIX_PADDING_MS}ms")
-        logger.info(
+            lines.append(f"  Phrase list: {self.PHRASE_LIST[:50]}...")
+        lines.append(f"  VAD prefix padding: {self.VAD_PREFIX_PADDING_MS}ms")
+        lines.append(
             f"  Video: {self.AVATAR_VIDEO_CODEC} @ {self.AVATAR_VIDEO_BITRATE} bps"
         )
-        logger.info(f"  Max response tokens: {self.MAX_RESPONSE_TOKENS}")
+        lines.append(f"  Max response tokens: {self.MAX_RESPONSE_TOKENS}")
 
         # Check API key
+        if self.VOICELIVE_API_KEY:
+            lines.append(f"  API Key: {_KEY_MASK}...{self.VOICELIVE_API_KEY[-4:]}")
+        elif self.USE_TOKEN_CREDENTIAL:
+            lines.append("  Auth: Using token credential")
+        lines.append("===================================")
+        self._log_lines = tuple(lines)
+        return self._log_lines
+
+    def validate_and_log(self):
+        """Validate configuration and log important settings."""
+        logger.info("\n".join(self._build_log_lines()))
+
         if not self.VOICELIVE_API_KEY and not self.USE_TOKEN_CREDENTIAL:
             logger.error(
                 "AZURE_VOICELIVE_API_KEY is not set and USE_TOKEN_CREDENTIAL is false!"
             )
-        elif self.VOICELIVE_API_KEY:
-            logger.info(f"  API Key: {'*' * 8}...{self.VOICELIVE_API_KEY[-4:]}")
-        else:
-            logger.info("  Auth: Using token credential")
 
         # Check model compatibility
-        if self.VOICELIVE_MODEL not in VOICELIVE_COMPATIBLE_MODELS:
+        if self.VOICELIVE_MODEL not in _load_models():
             logger.warning(
-                f"Model '{self.VOICELIVE_MODEL}' may not be supported for Voice Live. "
-                f"See: https://learn.microsoft.com/en-us/azure/ai-services/speech-service/regions?tabs=voice-live"
+                "Model '%s' may not be supported for Voice Live. "
+                "See: https://learn.microsoft.com/en-us/azure/ai-services/speech-service/regions?tabs=voice-live",
+                self.VOICELIVE_MODEL,
             )
-        logger.info("===================================")
-
 
 settings = Settings()
-settings.validate_and_log()
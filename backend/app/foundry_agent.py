@@ -5,48 +5,212 @@ Provides RAG-augmented responses using Azure AI Foundry Agents with file_search
 Supports both full agent processing (for text chat) and retrieval-only (for live voice).
 """
 
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-from typing import Optional, Any
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import TYPE_CHECKING, AsyncIterator, Optional, Any
 
-from azure.ai.agents import AgentsClient
+from .cache import ResponseCache
+from .config import settings
+
+# Azure SDK imports are deferred to initialize() so they are only paid for
+# when the Foundry Agent is actually enabled
+if TYPE_CHECKING:
+    from azure.ai.agents.aio import AgentsClient
 
 # Timeout for Foundry Agent operations
 FOUNDRY_OPERATION_TIMEOUT = 30.0  # 30 seconds
-from azure.ai.agents.models import ListSortOrder
-from azure.identity import DefaultAzureCredential
-
-from .config import settings
+# Agent runs slower than this count as overload for the adaptive run limiter
+FOUNDRY_TARGET_RUN_LATENCY = 10.0
+# Streaming run events (AgentStreamEvent values) handled by _run_for_reply()
+_EVENT_MESSAGE_COMPLETED = "thread.message.completed"
+_EVENTS_RUN_FAILED = frozenset({"thread.run.failed", "error"})
+_EVENT_DONE = "done"
+# Retrieval-only prompt prepended to the user's question in get_context()
+_CONTEXT_PROMPT_PREFIX = (
+    "Based on the knowledge base, what information is relevant to this question "
+    "(provide key facts only, no full answer): "
+)
 
 logger = logging.getLogger(__name__)
 
+# Per-request memo of get_context results (None outside a request scope).
+# Tasks spawned during the request inherit the same dict via context copying.
+_request_cache: ContextVar[Optional[dict[tuple, Optional[str]]]] = ContextVar(
+    "foundry_request_cache", default=None
+)
+
+
+def new_request_scope() -> None:
+    """Start a fresh get_context memo for the current client request."""
+    _request_cache.set({})
+
+
+class _AdaptiveLimiter:
+    """
+    AIMD concurrency limit for agent runs, shared by every session.
+
+    Each run that finishes within the target latency raises the limit
+    additively (up to the maximum); a throttled (HTTP 429 / rate-limit),
+    server-error (5xx), slow or timed-out run halves it (down to one). Other
+    failures leave it unchanged. A Retry-After hint pauses new runs, before
+    they take a slot, until it has elapsed.
+    """
+
+    __slots__ = (
+        "_limit",
+        "_max_limit",
+        "_in_flight",
+        "_target_latency",
+        "_resume_at",
+        "_cond",
+    )
+
+    _INCREASE = 0.5
+    _DECREASE = 0.5
+
+    def __init__(self, max_limit: int, target_latency: float):
+        self._limit = float(max_limit)
+        self._max_limit = max_limit
+        self._in_flight = 0
+        self._target_latency = target_latency
+        self._resume_at = 0.0
+        self._cond = asyncio.Condition()
+
+    @staticmethod
+    def _retry_after(error: BaseException) -> Optional[float]:
+        """Return the throttle delay for a rate-limit error, else None."""
+        if getattr(error, "status_code", None) == 429:
+            response = getattr(error, "response", None)
+            headers = getattr(response, "headers", None) or {}
+            try:
+                return float(headers.get("Retry-After", 0))
+            except ValueError:
+                return 0.0
+        # Streaming runs report throttling as a failed run, not an HTTP status
+        if "rate_limit" in str(error):
+            return 0.0
+        return None
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one run slot for the duration of the block."""
+        # Honour a Retry-After pause before taking a slot, so throttled
+        # callers don't hold capacity while they wait
+        while (delay := self._resume_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+
+        started = time.monotonic()
+        # None leaves the limit unchanged (ordinary failures say nothing
+        # about capacity); True halves it, False raises it
+        overloaded: Optional[bool] = True
+        try:
+            yield
+            overloaded = time.monotonic() - started > self._target_latency
+        except Exception as e:
+            retry_after = self._retry_after(e)
+            if retry_after:
+                self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+            # Only throttling and server errors signal overload
+            status = getattr(e, "status_code", None)
+            if retry_after is None and not (isinstance(status, int) and status >= 500):
+                overloaded = None
+            raise
+        finally:
+            # Timeouts and cancellation (BaseException) keep overloaded=True
+            if overloaded:
+                self._limit = max(1.0, self._limit * self._DECREASE)
+            elif overloaded is not None:
+                self._limit = min(self._max_limit, self._limit + self._INCREASE)
+            async with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+
+@lru_cache(maxsize=1)
+def _shared_credential():
+    """
+    Return the process-wide async credential (created on first use).
+
+    Uses ManagedIdentityCredential when AZURE_USE_MSI is set, avoiding
+    DefaultAzureCredential's probe of every credential source; otherwise
+    falls back to DefaultAzureCredential for local development.
+    """
+    if settings.AZURE_USE_MSI:
+        from azure.identity.aio import ManagedIdentityCredential
+
+        return ManagedIdentityCredential(client_id=settings.AZURE_CLIENT_ID or None)
+
+    from azure.identity.aio import DefaultAzureCredential
+
+    return DefaultAzureCredential()
+
 
 class FoundryAgentService:
     """
     Manages Azure AI Foundry Agent for RAG-augmented conversations.
 
-    Uses AgentsClient to interact with a pre-configured agent
-    that has file_search tool for knowledge retrieval.
+    Uses the async AgentsClient to interact with a pre-configured agent
+    that has file_search tool for knowledge retrieval, so Foundry round-trips
+    never block the event loop.
     """
 
+    __slots__ = (
+        "_client",
+        "_agent",
+        "_initialized",
+        "_thread_pool",
+        "_background_tasks",
+        "_query_cache",
+        "_context_cache",
+        "_run_limiter",
+    )
+
     def __init__(self):
-        self._client: Optional[AgentsClient] = None
+        self._client: Optional["AgentsClient"] = None
         self._agent: Any = None  # Agent object from get_agent()
         self._initialized = False
-        # Thread pool for timeout-protected operations
-        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="foundry")
+        # Pre-created empty Foundry threads, each used for one process_query
+        # call so no reply ever sees another session's messages
+        self._thread_pool: asyncio.Queue[str] = asyncio.Queue(
+            maxsize=settings.FOUNDRY_THREAD_POOL_SIZE
+        )
+        # Thread deletions and pool refills running off the request path
+        # (drained in cleanup)
+        self._background_tasks: set[asyncio.Task] = set()
+        # Adaptive cap on concurrent agent runs across all sessions
+        self._run_limiter = _AdaptiveLimiter(
+            settings.FOUNDRY_MAX_CONCURRENT_RUNS, FOUNDRY_TARGET_RUN_LATENCY
+        )
+        # Separate caches for full responses and retrieval-only context
+        self._query_cache: Optional[ResponseCache] = None
+        self._context_cache: Optional[ResponseCache] = None
+        if settings.FOUNDRY_CACHE_ENABLED:
+            self._query_cache = ResponseCache(
+                settings.FOUNDRY_CACHE_MAX_ENTRIES, settings.FOUNDRY_CACHE_TTL_SECONDS
+            )
+            self._context_cache = ResponseCache(
+                settings.FOUNDRY_CACHE_MAX_ENTRIES, settings.FOUNDRY_CACHE_TTL_SECONDS
+            )
 
     @property
     def enabled(self) -> bool:
         """Check if Foundry Agent is enabled and initialized."""
-        return settings.FOUNDRY_AGENT_ENABLED and self._initialized
+        # initialize() only succeeds when FOUNDRY_AGENT_ENABLED is set
+        return self._initialized
 
     @property
     def agent_id(self) -> Optional[str]:
         """Get the current agent ID."""
         return self._agent.id if self._agent else None
 
-    def create_thread(self) -> Optional[str]:
+    async def create_thread(self) -> Optional[str]:
         """
         Create a new thread and return its ID.
 
@@ -61,14 +225,14 @@ class FoundryAgentService:
             return None
 
         try:
-            thread = self._client.threads.create()
-            logger.info(f"Created session thread: {thread.id}")
+            thread = await self._client.threads.create()
+            logger.info("Created session thread: %s", thread.id)
             return thread.id
         except Exception as e:
-            logger.error(f"Failed to create thread: {e}")
+            logger.error("Failed to create thread: %s", e)
             return None
 
-    def delete_thread(self, thread_id: str) -> None:
+    async def delete_thread(self, thread_id: str) -> None:
         """
         Delete a thread by ID.
 
@@ -82,12 +246,115 @@ class FoundryAgentService:
             return
 
         try:
-            self._client.threads.delete(thread_id)
-            logger.info(f"Deleted session thread: {thread_id}")
+            await self._client.threads.delete(thread_id)
+            logger.info("Deleted session thread: %s", thread_id)
+        except Exception as e:
+            logger.warning("Failed to delete thread %s: %s", thread_id, e)
+
+    async def _create_query_thread(self) -> str:
+        """Create a fresh thread for the query pool."""
+        thread = await self._client.threads.create()
+        logger.debug("Created pooled thread: %s", thread.id)
+        return thread.id
+
+    async def _fill_thread_pool(self) -> None:
+        """Pre-create idle query threads up to FOUNDRY_THREAD_POOL_SIZE."""
+        missing = self._thread_pool.maxsize - self._thread_pool.qsize()
+        results = await asyncio.gather(
+            *(self._create_query_thread() for _ in range(missing)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning("Failed to pre-create pooled thread: %s", result)
+            else:
+                self._thread_pool.put_nowait(result)
+
+    async def _acquire_query_thread(self) -> str:
+        """Take an empty pooled thread, creating a new one if the pool is empty."""
+        try:
+            return self._thread_pool.get_nowait()
+        except asyncio.QueueEmpty:
+            return await self._create_query_thread()
+
+    async def _delete_thread_quietly(self, thread_id: str) -> None:
+        """Delete a thread, logging (not raising) on failure."""
+        try:
+            await self._client.threads.delete(thread_id)
+            logger.debug("Deleted thread: %s", thread_id)
         except Exception as e:
-            logger.warning(f"Failed to delete thread {thread_id}: {e}")
+            logger.warning("Failed to delete thread %s: %s", thread_id, e)
+
+    def _run_in_background(self, coro: Any) -> None:
+        """Schedule Foundry housekeeping so callers don't wait on the round-trip."""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _delete_thread_in_background(self, thread_id: str) -> None:
+        """Schedule a thread deletion off the request path."""
+        self._run_in_background(self._delete_thread_quietly(thread_id))
+
+    async def _refill_thread_pool(self) -> None:
+        """Top the pool back up with one empty thread, logging on failure."""
+        if self._thread_pool.full():
+            return
+        try:
+            thread_id = await self._create_query_thread()
+        except Exception as e:
+            logger.warning("Failed to refill thread pool: %s", e)
+            return
+        try:
+            self._thread_pool.put_nowait(thread_id)
+        except asyncio.QueueFull:
+            await self._delete_thread_quietly(thread_id)
+
+    def _release_query_thread(self, thread_id: str) -> None:
+        """
+        Delete a used query thread and replace it with an empty one.
 
-    def initialize(self) -> bool:
+        Threads are never returned to the pool once they hold messages, since
+        the pool is shared by every session and a reused thread's history would
+        leak one user's conversation into another user's reply.
+        """
+        self._delete_thread_in_background(thread_id)
+        self._run_in_background(self._refill_thread_pool())
+
+    async def _run_for_reply(self, thread_id: str) -> Optional[str]:
+        """
+        Run the agent on a thread and return the assistant's reply text.
+
+        Uses the streaming run API: completion is pushed as soon as the server
+        has it (create_and_process polls run status once a second), and the
+        completed assistant message arrives in the stream, so no follow-up
+        messages.list call is needed.
+
+        Runs are gated by the shared adaptive limiter, which backs off when
+        Foundry throttles or slows down.
+
+        Raises:
+            RuntimeError: If the run fails or the stream reports an error
+        """
+        reply = None
+        async with self._run_limiter.slot():
+            stream = await self._client.runs.stream(
+                thread_id=thread_id, agent_id=self._agent.id
+            )
+            async with stream as events:
+                async for event_type, data, _ in events:
+                    if (
+                        event_type == _EVENT_MESSAGE_COMPLETED
+                        and data.role == "assistant"
+                        and data.text_messages
+                    ):
+                        reply = data.text_messages[-1].text.value
+                    elif event_type in _EVENTS_RUN_FAILED:
+                        raise RuntimeError(getattr(data, "last_error", None) or data)
+                    elif event_type == _EVENT_DONE:
+                        break
+        return reply
+
+    async def initialize(self) -> bool:
         """
         Initialize the Foundry Agent service.
 
@@ -103,38 +370,44 @@ class FoundryAgentService:
             logger.info("Foundry Agent is disabled")
             return False
 
-        if not settings.FOUNDRY_ENDPOINT:
-            logger.warning("Foundry Agent enabled but FOUNDRY_ENDPOINT not set")
-            return False
-
-        if not settings.FOUNDRY_AGENT_ID:
-            logger.warning("Foundry Agent enabled but FOUNDRY_AGENT_ID not set")
+        required = (
+            ("FOUNDRY_ENDPOINT", settings.FOUNDRY_ENDPOINT),
+            ("FOUNDRY_AGENT_ID", settings.FOUNDRY_AGENT_ID),
+        )
+        missing = [name for name, value in required if not value]
+        if missing:
+            logger.warning("Foundry Agent enabled but %s not set", ", ".join(missing))
             return False
 
         try:
-            logger.info(f"Connecting to Foundry at {settings.FOUNDRY_ENDPOINT}")
+            from azure.ai.agents.aio import AgentsClient
+
+            logger.info("Connecting to Foundry at %s", settings.FOUNDRY_ENDPOINT)
 
-            # Create AgentsClient with DefaultAzureCredential
+            # Create AgentsClient with the shared credential
             # Endpoint must be the full project URL:
             # https://<instance>.services.ai.azure.com/api/projects/<project>
             self._client = AgentsClient(
                 endpoint=settings.FOUNDRY_ENDPOINT,
-                credential=DefaultAzureCredential(),
+                credential=_shared_credential(),
             )
 
             # Fetch the agent object
-            self._agent = self._client.get_agent(settings.FOUNDRY_AGENT_ID)
-            logger.info(f"Using Foundry Agent: {self._agent.id}")
+            self._agent = await self._client.get_agent(settings.FOUNDRY_AGENT_ID)
+            logger.info("Using Foundry Agent: %s", self._agent.id)
+
+            # Warm the query thread pool so first queries skip threads.create
+            await self._fill_thread_pool()
 
             self._initialized = True
             logger.info("Foundry Agent service initialized successfully")
             return True
 
         except Exception as e:
-            logger.error(f"Failed to initialize Foundry Agent: {e}")
+            logger.error("Failed to initialize Foundry Agent: %s", e)
             return False
 
-    def process_query(self, query: str) -> Optional[str]:
+    async def process_query(self, query: str) -> Optional[str]:
         """
         Process a query through the Foundry Agent (full RAG + LLM).
 
@@ -151,64 +424,56 @@ class FoundryAgentService:
             logger.warning("Cannot process query: agent not initialized")
             return None
 
-        thread = None
+        # Replies come from an empty single-use thread (see
+        # _release_query_thread), so they depend only on the question and are
+        # safe to share across sessions
+        cache_key = (ResponseCache.normalize(query),)
+        if self._query_cache:
+            cached = self._query_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Agent response served from cache")
+                return cached
+
+        thread_id = None
         try:
-            # Create a new thread
-            thread = self._client.threads.create()
-            logger.debug(f"Created thread: {thread.id}")
+            # Use a pre-created empty thread to skip the create round-trip
+            thread_id = await self._acquire_query_thread()
 
             # Add user message
-            self._client.messages.create(
-                thread_id=thread.id, role="user", content=query
+            await self._client.messages.create(
+                thread_id=thread_id, role="user", content=query
             )
 
             # Run the agent with timeout to prevent hanging
             try:
-                future = self._executor.submit(
-                    self._client.runs.create_and_process,
-                    thread_id=thread.id,
-                    agent_id=self._agent.id,
+                response_text = await asyncio.wait_for(
+                    self._run_for_reply(thread_id), timeout=FOUNDRY_OPERATION_TIMEOUT
                 )
-                run = future.result(timeout=FOUNDRY_OPERATION_TIMEOUT)
-            except FuturesTimeoutError:
-                logger.error(f"Agent run timed out after {FOUNDRY_OPERATION_TIMEOUT}s")
+            except asyncio.TimeoutError:
+                logger.error("Agent run timed out after %ss", FOUNDRY_OPERATION_TIMEOUT)
                 return None
             except Exception as e:
-                logger.error(f"Agent run failed: {e}")
+                logger.error("Agent run failed: %s", e)
                 return None
 
-            if run.status == "failed":
-                logger.error(f"Agent run failed: {run.last_error}")
+            if response_text is None:
+                logger.warning("No assistant response found")
                 return None
 
-            # Get the messages
-            messages = self._client.messages.list(
-                thread_id=thread.id, order=ListSortOrder.ASCENDING
-            )
-
-            # Find the assistant's response (last assistant message)
-            for msg in messages:
-                if msg.role == "assistant" and msg.text_messages:
-                    response_text = msg.text_messages[-1].text.value
-                    logger.info(f"Agent response: {response_text[:100]}...")
-                    return response_text
-
-            logger.warning("No assistant response found")
-            return None
+            logger.info("Agent response: %s...", response_text[:100])
+            if self._query_cache:
+                self._query_cache.put(cache_key, response_text)
+            return response_text
 
         except Exception as e:
-            logger.error(f"Error processing query: {e}")
+            logger.error("Error processing query: %s", e)
             return None
         finally:
-            # Always delete the thread to prevent resource accumulation
-            if thread and self._client:
-                try:
-                    self._client.threads.delete(thread.id)
-                    logger.debug(f"Deleted thread: {thread.id}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete thread {thread.id}: {e}")
-
-    def get_context(
+            # Each thread serves one query; delete it and warm a replacement
+            if thread_id and self._client:
+                self._release_query_thread(thread_id)
+
+    async def get_context(
         self,
         query: str,
         thread_id: Optional[str] = None,
@@ -235,83 +500,164 @@ class FoundryAgentService:
         if not self._client or not self._agent:
             return None
 
+        # Context depends on the preceding messages as well as the question.
+        # A session thread also carries that session's history, so its results
+        # are keyed by thread and never served to other sessions; only
+        # stateless lookups (thread_id None) share entries.
+        cache_key = (
+            thread_id,
+            ResponseCache.normalize(query),
+            *map(ResponseCache.normalize, conversation_context or ()),
+        )
+        request_cache = _request_cache.get()
+        if request_cache is not None and cache_key in request_cache:
+            logger.debug("Retrieved context reused within request")
+            return request_cache[cache_key]
+        if self._context_cache:
+            cached = self._context_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Retrieved context served from cache")
+                return cached
+
+        context = await self._retrieve_context(query, thread_id, conversation_context)
+        if request_cache is not None:
+            request_cache[cache_key] = context
+        if context and self._context_cache:
+            self._context_cache.put(cache_key, context)
+        return context
+
+    async def _retrieve_context(
+        self,
+        query: str,
+        thread_id: Optional[str],
+        conversation_context: Optional[list[str]],
+    ) -> Optional[str]:
+        """Run the retrieval-only agent query behind get_context()."""
         # Determine if we're in session-based or stateless mode
         session_based = thread_id is not None
         local_thread = None
 
         try:
             # Build context-aware query if conversation context provided
-            if conversation_context:
-                context_prefix = "Previous conversation context:\n"
-                context_prefix += "\n".join(f"- {msg}" for msg in conversation_context)
-                context_prefix += f"\n\nCurrent question: {query}"
-                context_query = f"Based on the knowledge base, what information is relevant to this question (provide key facts only, no full answer): {context_prefix}"
-            else:
-                context_query = f"Based on the knowledge base, what information is relevant to this question (provide key facts only, no full answer): {query}"
+            history = (
+                "\n".join(f"- {msg}" for msg in conversation_context)
+                if conversation_context
+                else ""
+            )
+            question = (
+                f"Previous conversation context:\n{history}\n\nCurrent question: {query}"
+                if history
+                else query
+            )
+            context_query = _CONTEXT_PROMPT_PREFIX + question
 
-            logger.debug(f"Context retrieval query (thread={thread_id or 'new'}):\n{context_query}")
+            logger.debug(
+                "Context retrieval query (thread=%s):\n%s",
+                thread_id or "new",
+                context_query,
+            )
 
             # Use existing thread or create new one
             if session_based:
                 active_thread_id = thread_id
             else:
-                local_thread = self._client.threads.create()
+                local_thread = await self._client.threads.create()
                 active_thread_id = local_thread.id
 
-            self._client.messages.create(
+            await self._client.messages.create(
                 thread_id=active_thread_id, role="user", content=context_query
             )
 
             # Run with timeout to prevent hanging
             try:
-                future = self._executor.submit(
-                    self._client.runs.create_and_process,
-                    thread_id=active_thread_id,
-                    agent_id=self._agent.id,
+                context = await asyncio.wait_for(
+                    self._run_for_reply(active_thread_id),
+                    timeout=FOUNDRY_OPERATION_TIMEOUT,
+                )
+            except asyncio.TimeoutError:
+                logger.error(
+                    "Context retrieval timed out after %ss", FOUNDRY_OPERATION_TIMEOUT
                 )
-                run = future.result(timeout=FOUNDRY_OPERATION_TIMEOUT)
-            except FuturesTimeoutError:
-                logger.error(f"Context retrieval timed out after {FOUNDRY_OPERATION_TIMEOUT}s")
                 return None
             except Exception as e:
-                logger.error(f"Context retrieval run failed: {e}")
+                logger.error("Context retrieval run failed: %s", e)
                 return None
 
-            if run.status == "failed":
-                logger.error(f"Context retrieval failed: {run.last_error}")
+            if context is None:
                 return None
 
-            messages = self._client.messages.list(
-                thread_id=active_thread_id, order=ListSortOrder.DESCENDING
+            logger.info(
+                "Retrieved context (%s chars): %s...", len(context), context[:100]
             )
-
-            for msg in messages:
-                if msg.role == "assistant" and msg.text_messages:
-                    context = msg.text_messages[-1].text.value
-                    logger.info(f"Retrieved context ({len(context)} chars): {context[:100]}...")
-                    logger.debug(f"Full retrieved context:\n{context}")
-                    return f"Relevant information from knowledge base:\n{context}"
-
-            return None
+            logger.debug("Full retrieved context:\n%s", context)
+            return f"Relevant information from knowledge base:\n{context}"
 
         except Exception as e:
-            logger.error(f"Error getting context: {e}")
+            logger.error("Error getting context: %s", e)
             return None
         finally:
             # Only delete thread if we created it (stateless mode)
             if local_thread and self._client:
-                try:
-                    self._client.threads.delete(local_thread.id)
-                    logger.debug(f"Deleted thread: {local_thread.id}")
-                except Exception as e:
-                    logger.warning(f"Failed to delete thread {local_thread.id}: {e}")
+                self._delete_thread_in_background(local_thread.id)
 
-    def cleanup(self) -> None:
+    async def cleanup(self) -> None:
         """Clean up resources (call on shutdown if needed)."""
-        if self._executor:
-            self._executor.shutdown(wait=False)
+        if self._client:
+            # Let in-flight deletions and refills finish, then delete the idle
+            # pooled threads so they don't accumulate server-side
+            if self._background_tasks:
+                await asyncio.gather(*self._background_tasks, return_exceptions=True)
+            idle_threads = []
+            while not self._thread_pool.empty():
+                idle_threads.append(self._thread_pool.get_nowait())
+            await asyncio.gather(*map(self._delete_thread_quietly, idle_threads))
+            await self._client.close()
+            self._client = None
+            await _shared_credential().close()
+            _shared_credential.cache_clear()
+        for cache in (self._query_cache, self._context_cache):
+            if cache:
+                cache.clear()
+        self._agent = None
+        self._initialized = False
         logger.info("Foundry Agent service cleanup complete")
 
 
+class _DisabledFoundryAgentService:
+    """
+    Null stand-in for FoundryAgentService when FOUNDRY_AGENT_ENABLED is false.
+
+    Every operation is a no-op, so callers need no client/agent guards.
+    """
+
+    __slots__ = ()
+
+    enabled = False
+    agent_id = None
+
+    async def initialize(self) -> bool:
+        logger.info("Foundry Agent is disabled")
+        return False
+
+    async def create_thread(self) -> None:
+        return None
+
+    async def delete_thread(self, thread_id: str) -> None:
+        pass
+
+    async def process_query(self, query: str) -> None:
+        return None
+
+    async def get_context(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def cleanup(self) -> None:
+        pass
+
+
 # Global instance
-foundry_agent = FoundryAgentService()
+foundry_agent: FoundryAgentService | _DisabledFoundryAgentService = (
+    FoundryAgentService()
+    if settings.FOUNDRY_AGENT_ENABLED
+    else _DisabledFoundryAgentService()
+)
@@ -6,48 +6,96 @@ handling audio streaming and avatar WebRTC signaling.
 """
 
 import asyncio
-import base64
-import json
+import binascii
 import logging
 import time
+import uuid
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Callable, Optional
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+# SIMD base64: the strict decoder validates client audio/SDP, and the encoder
+# serves audio to clients without binary frames
+from pybase64 import b64decode as _strict_b64decode
+from pybase64 import b64encode_as_string as _b64encode
 
+from .config import settings
 from .voice_live import VoiceAvatarSession
-from .foundry_agent import foundry_agent
+from .foundry_agent import foundry_agent, new_request_scope
 
 # Input validation constants
 MAX_AUDIO_CHUNK_SIZE = 100 * 1024  # 100KB max for audio chunks
+MAX_AUDIO_CHUNK_BYTES = MAX_AUDIO_CHUNK_SIZE * 3 // 4  # Same limit for raw (binary) audio
 MAX_SDP_SIZE = 10 * 1024  # 10KB max for SDP
 MAX_TEXT_INPUT_SIZE = 4096  # 4KB max for text input
 WEBSOCKET_IDLE_TIMEOUT = 60.0  # 60 seconds idle timeout for client messages
 WEBSOCKET_ACCEPT_TIMEOUT = 10.0  # 10 seconds timeout for WebSocket accept
 MAX_ACTIVE_SESSIONS = 50  # Prevent resource exhaustion
+# Pending frames per client: audio producers wait for space, other events are dropped
+OUTBOUND_QUEUE_MAXSIZE = 256
+SENDER_FLUSH_TIMEOUT = 2.0  # Time allowed to flush queued frames on disconnect
+# Server WebSocket settings (also passed on the uvicorn command line in the Dockerfile).
+# Frames are capped well above the largest valid message; compression stays off
+# because PCM/base64 audio barely compresses and deflate costs CPU on every frame.
+WS_MAX_SIZE = 1024 * 1024  # 1MB
+WS_PER_MESSAGE_DEFLATE = False
+
+# Binary WebSocket frames: first byte is the frame type, the rest is the payload
+BINARY_FRAME_AUDIO = 0x01  # Raw PCM16 audio (both directions)
+BINARY_FRAME_SDP = 0x02  # UTF-8 client SDP
+_AUDIO_FRAME_PREFIX = bytes([BINARY_FRAME_AUDIO])
+# Subprotocol offered by clients that exchange audio as binary frames
+WS_SUBPROTOCOL = "voice-avatar-v2"
+
+# Pre-serialized frames for the type-only status events forwarded from VoiceLive
+_STATIC_FRAMES = {
+    event_type: orjson.dumps({"type": event_type}).decode()
+    for event_type in (
+        "avatar.connected",
+        "user.speaking.started",
+        "user.speaking.stopped",
+        "assistant.response.started",
+        "assistant.speaking.done",
+        "assistant.response.done",
+        "assistant.response.cancelled",
+    )
+}
 
 
 class RateLimiter:
-    """Simple token bucket rate limiter for WebSocket messages."""
+    """
+    Token-bucket rate limiter for WebSocket messages.
+
+    Allows bursts of up to max_messages, refilled continuously at
+    max_messages per window_seconds. O(1) time and memory per check.
+    """
 
-    def __init__(self, max_messages: int = 100, window_seconds: float = 1.0):
-        self.max_messages = max_messages
-        self.window = window_seconds
-        # Use collections.deque for O(1) append/popleft instead of list filtering
-        from collections import deque
-        self.messages: deque[float] = deque(maxlen=max_messages * 2)  # Bounded
+    __slots__ = ("capacity", "rate", "tokens", "last", "_clock")
+
+    def __init__(
+        self,
+        max_messages: int = 100,
+        window_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = float(max_messages)
+        self.rate = max_messages / window_seconds
+        self.tokens = self.capacity
+        # Monotonic clock so wall-clock adjustments can't drain or overfill the
+        # bucket; injectable so tests can advance time without sleeping
+        self._clock = clock
+        self.last = clock()
 
     def allow(self) -> bool:
         """Check if a message is allowed under the rate limit."""
-        now = time.time()
-        cutoff = now - self.window
-        # Remove messages outside the window (from the front)
-        while self.messages and self.messages[0] < cutoff:
-            self.messages.popleft()
-        if len(self.messages) >= self.max_messages:
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens < 1.0:
             return False
-        self.messages.append(now)
+        self.tokens -= 1.0
         return True
 
 
@@ -63,10 +111,10 @@ def validate_base64_data(data: str, max_size: int) -> tuple[bool, Optional[str]]
     if len(data) > max_size:
         return False, f"Data exceeds maximum size ({len(data)} > {max_size})"
     try:
-        base64.b64decode(data, validate=True)
-        return True, None
-    except Exception as e:
+        _strict_b64decode(data, validate=True)
+    except binascii.Error as e:
         return False, f"Invalid base64 encoding: {e}"
+    return True, None
 
 
 logging.basicConfig(
@@ -75,7 +123,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Track active sessions for monitoring
-active_sessions: set[int] = set()
+active_sessions: set[str] = set()
 
 # Suppress verbose HTTP library logging (response headers, etc.)
 logging.getLogger("azure").setLevel(logging.WARNING)
@@ -90,17 +138,37 @@ logging.getLogger("urllib3").setLevel(logging.WARNING)
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("Voice Avatar backend starting...")
+    settings.validate_and_log()
 
     # Initialize Foundry Agent for RAG (if enabled)
-    if foundry_agent.initialize():
-        logger.info(f"Foundry Agent initialized (agent_id: {foundry_agent.agent_id})")
+    if await foundry_agent.initialize():
+        logger.info("Foundry Agent initialized (agent_id: %s)", foundry_agent.agent_id)
     else:
         logger.info("Foundry Agent not enabled or initialization failed")
 
+    # Initialize Azure Search retrieval up front so the first query doesn't pay for it
+    rag_retriever = None
+    if settings.RAG_ENABLED:
+        try:
+            # Lazy: azure-search-documents is the optional "rag" extra
+            from .rag import rag_retriever
+        except ImportError as e:
+            logger.error(
+                "RAG_ENABLED is set but azure-search-documents is not installed "
+                "(install the 'rag' extra: uv sync --extra rag); "
+                "Azure Search retrieval disabled: %s",
+                e,
+            )
+        else:
+            rag_retriever.initialize()
+
     yield
 
     # Cleanup
-    foundry_agent.cleanup()
+    await foundry_agent.cleanup()
+    if rag_retriever is not None:
+        # Long-lived search client: its connection pool is closed only here
+        await rag_retriever.close()
     logger.info("Voice Avatar backend shutting down...")
 
 
@@ -121,6 +189,115 @@ app.add_middleware(
 )
 
 
+class ClientSender:
+    """
+    Per-connection outbound queue drained by a single sender task.
+
+    Producers (VoiceLive event forwarding and client message handlers) enqueue
+    pre-serialized frames without awaiting the socket; the sender task writes
+    queued frames back-to-back. Assistant audio waits for queue space rather
+    than being dropped, so a slow client applies backpressure to event
+    forwarding instead of hearing gaps. Clients on the binary subprotocol
+    receive assistant audio as binary frames, others as base64 in JSON.
+
+    Once the sender task has stopped (client gone or a send failed), every
+    send is a no-op and `closed` tells producers to stop.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        binary: bool = False,
+        maxsize: int = OUTBOUND_QUEUE_MAXSIZE,
+    ):
+        self._websocket = websocket
+        # Pick the audio encoding once per connection rather than per chunk
+        self.send_audio = self._send_audio_frame if binary else self._send_audio_json
+        self._queue: asyncio.Queue[Optional[str | bytes]] = asyncio.Queue(
+            maxsize=maxsize
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """True once the sender task has stopped and frames are discarded."""
+        return self._closed
+
+    def start(self) -> None:
+        """Start the sender task."""
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, event: dict) -> None:
+        """Queue an event for the client as a JSON text frame (orjson-serialized)."""
+        if self._closed:
+            return
+        frame = _STATIC_FRAMES.get(event.get("type")) if len(event) == 1 else None
+        if frame is None:
+            frame = orjson.dumps(event).decode()
+        try:
+            self._queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            logger.warning("Outbound queue full, dropping %s event", event.get("type"))
+
+    async def _put_audio(self, frame: str | bytes) -> None:
+        """Queue an audio frame, waiting for space so no audio is dropped."""
+        if not self._closed:
+            await self._queue.put(frame)
+
+    async def _send_audio_frame(self, audio: bytes) -> None:
+        """Queue raw PCM16 assistant audio as a binary frame."""
+        await self._put_audio(_AUDIO_FRAME_PREFIX + audio)
+
+    async def _send_audio_json(self, audio: bytes) -> None:
+        """Queue raw PCM16 assistant audio as a base64 audio.delta event."""
+        await self._put_audio(
+            orjson.dumps({"type": "audio.delta", "data": _b64encode(audio)}).decode()
+        )
+
+    async def _send_frame(self, frame: str | bytes) -> None:
+        if isinstance(frame, bytes):
+            await self._websocket.send_bytes(frame)
+        else:
+            await self._websocket.send_text(frame)
+
+    async def _run(self) -> None:
+        queue = self._queue
+        send_frame = self._send_frame
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    return
+                await send_frame(frame)
+                # Drain whatever else is already queued without going back to get()
+                while not queue.empty():
+                    frame = queue.get_nowait()
+                    if frame is None:
+                        return
+                    await send_frame(frame)
+        except Exception as e:
+            logger.error("Error sending event to client: %s", e)
+        finally:
+            self._closed = True
+            # Discard unsent frames so producers blocked on a full queue wake up
+            while not queue.empty():
+                queue.get_nowait()
+
+    async def close(self) -> None:
+        """Flush queued frames and stop the sender task."""
+        if self._task is None or self._task.done():
+            return
+        try:
+            # Queued audio is flushed too, so wait for room for the sentinel;
+            # give up and cancel the sender if the client stops reading
+            async with asyncio.timeout(SENDER_FLUSH_TIMEOUT):
+                await self._queue.put(None)
+                await self._task
+        except TimeoutError:
+            self._task.cancel()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -146,298 +323,407 @@ async def voice_avatar_websocket(websocket: WebSocket):
     - Server establishes VoiceLive connection and sends session.ready with ICE servers
     - Client sends client SDP for avatar WebRTC
     - Server forwards to VoiceLive and returns server SDP
-    - Client sends audio chunks as base64
-    - Server forwards VoiceLive events (transcripts, status updates)
+    - Client sends audio chunks as binary frames (type byte + raw PCM16),
+      or as base64 in JSON "audio" messages
+    - Server forwards VoiceLive events (transcripts, status updates); assistant
+      audio goes out as binary frames to clients on the subprotocol
     """
     # Check session limit before accepting
     if len(active_sessions) >= MAX_ACTIVE_SESSIONS:
-        logger.warning(f"Rejecting connection: max sessions ({MAX_ACTIVE_SESSIONS}) reached")
+        logger.warning(
+            "Rejecting connection: max sessions (%s) reached", MAX_ACTIVE_SESSIONS
+        )
         await websocket.close(code=1013, reason="Server at capacity")
         return
 
+    # Echo the binary-audio subprotocol when offered; older clients connect without it
+    offered = websocket.scope.get("subprotocols", ())
+    subprotocol = WS_SUBPROTOCOL if WS_SUBPROTOCOL in offered else None
+
     # Accept with timeout
     try:
-        await asyncio.wait_for(websocket.accept(), timeout=WEBSOCKET_ACCEPT_TIMEOUT)
+        await asyncio.wait_for(
+            websocket.accept(subprotocol=subprotocol),
+            timeout=WEBSOCKET_ACCEPT_TIMEOUT,
+        )
     except asyncio.TimeoutError:
         logger.error("WebSocket accept timed out")
         return
 
-    session_id = id(websocket)
+    # Unique per connection (id() values are reused once a websocket is freed)
+    session_id = uuid.uuid4().hex
     active_sessions.add(session_id)
     logger.info(
-        f"WebSocket client connected (session={session_id}, active={len(active_sessions)})"
+        "WebSocket client connected (session=%s, active=%s)",
+        session_id,
+        len(active_sessions),
     )
 
     session = VoiceAvatarSession()
-    event_task = None
+    sender = ClientSender(websocket, binary=subprotocol is not None)
+    sender.start()
     rate_limiter = RateLimiter(max_messages=200, window_seconds=1.0)
-    audio_chunk_count = 0  # Per-connection counter (not global)
 
     try:
         # Connect to VoiceLive
         await session.connect()
 
-        # Start event processing in background
+        # Forward VoiceLive events to the client alongside the receive loop
         async def forward_events():
             """Forward VoiceLive events to WebSocket client."""
-            async for event in session.process_events():
-                try:
-                    await websocket.send_json(event)
-                except Exception as e:
-                    logger.error(f"Error sending event to client: {e}")
-                    break
+            try:
+                async for event in session.process_events():
+                    if sender.closed:
+                        # Client can no longer receive anything; stop forwarding
+                        break
+                    if event["type"] == "audio.delta":
+                        await sender.send_audio(event["data"])
+                    else:
+                        sender.send(event)
+            except Exception as e:
+                logger.error("Error forwarding VoiceLive events: %s", e)
 
-        event_task = asyncio.create_task(forward_events())
+        # The task group cancels and awaits event forwarding when the receive
+        # loop ends, so no events are forwarded once cleanup starts
+        async with asyncio.TaskGroup() as tg:
+            event_task = tg.create_task(forward_events())
 
-        # Handle incoming messages from client
-        while True:
-            try:
-                # Add idle timeout to detect stale clients and prevent leaked Azure connections
-                data = await asyncio.wait_for(
-                    websocket.receive_text(), timeout=WEBSOCKET_IDLE_TIMEOUT
-                )
-
-                # Rate limiting - check AFTER receiving the message
-                # Debug: log message rate when approaching limit
-                msg_count = len(rate_limiter.messages)
-                if msg_count > 100:  # Only log when approaching limit
-                    logger.debug(f"Rate limiter: {msg_count} messages in window")
-
-                if not rate_limiter.allow():
-                    logger.warning("Rate limit exceeded for client")
-                    await websocket.send_json(
-                        {
-                            "type": "error",
-                            "message": "Rate limit exceeded",
-                            "code": "rate_limited",
-                        }
-                    )
-                    continue
-
-                message = json.loads(data)
-                audio_chunk_count = await handle_client_message(
-                    session, message, websocket, audio_chunk_count
-                )
-            except asyncio.TimeoutError:
-                logger.info(
-                    f"WebSocket idle timeout ({WEBSOCKET_IDLE_TIMEOUT}s) - closing connection"
-                )
+            # Handle incoming messages from client
+            while True:
                 try:
-                    await websocket.send_json(
+                    # Idle timeout detects stale clients, preventing leaked Azure connections
+                    frame = await asyncio.wait_for(
+                        websocket.receive(), timeout=WEBSOCKET_IDLE_TIMEOUT
+                    )
+                    if frame["type"] == "websocket.disconnect":
+                        raise WebSocketDisconnect(frame.get("code", 1000))
+
+                    # Rate limiting - check AFTER receiving the message
+                    if not rate_limiter.allow():
+                        logger.warning("Rate limit exceeded for client")
+                        sender.send(
+                            {
+                                "type": "error",
+                                "message": "Rate limit exceeded",
+                                "code": "rate_limited",
+                            },
+                        )
+                        continue
+
+                    # Debug: log when the bucket is more than half drained
+                    if rate_limiter.tokens < rate_limiter.capacity / 2:
+                        logger.debug(
+                            "Rate limiter: %.0f tokens left", rate_limiter.tokens
+                        )
+
+                    # Binary frames carry audio/SDP without JSON or base64 overhead
+                    if frame.get("bytes") is not None:
+                        await handle_binary_frame(session, frame["bytes"], sender)
+                        continue
+
+                    message = orjson.loads(frame.get("text") or "")
+                    await handle_client_message(session, message, sender)
+                except asyncio.TimeoutError:
+                    logger.info(
+                        "WebSocket idle timeout (%ss) - closing connection",
+                        WEBSOCKET_IDLE_TIMEOUT,
+                    )
+                    sender.send(
                         {
                             "type": "error",
                             "message": "Connection timed out due to inactivity",
                             "code": "idle_timeout",
-                        }
+                        },
                     )
-                except Exception:
-                    pass
-                break
-            except WebSocketDisconnect:
-                logger.info("WebSocket client disconnected")
-                break
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON from client: {e}")
-                try:
-                    await websocket.send_json(
+                    break
+                except WebSocketDisconnect:
+                    logger.info("WebSocket client disconnected")
+                    break
+                except orjson.JSONDecodeError as e:
+                    logger.error("Invalid JSON from client: %s", e)
+                    sender.send(
                         {
                             "type": "error",
                             "message": "Invalid JSON format",
                             "code": "invalid_json",
-                        }
+                        },
                     )
-                except Exception:
-                    pass
-            except Exception as e:
-                logger.error(f"Error handling client message: {e}")
-                # Notify client before breaking connection
-                try:
-                    await websocket.send_json(
+                except Exception as e:
+                    logger.error("Error handling client message: %s", e)
+                    # Notify client before breaking connection
+                    sender.send(
                         {
                             "type": "error",
                             "message": f"Server error: {str(e)}",
                             "code": "internal_error",
-                        }
+                        },
                     )
-                except Exception:
-                    pass
-                break
+                    break
+
+            event_task.cancel()
 
     except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+        logger.error("WebSocket error: %s", e)
         # Always try to notify the client about the error
-        try:
-            await websocket.send_json(
-                {
-                    "type": "error",
-                    "message": f"Connection error: {str(e)}",
-                    "code": "connection_error",
-                }
-            )
-        except Exception:
-            pass
+        sender.send(
+            {
+                "type": "error",
+                "message": f"Connection error: {str(e)}",
+                "code": "connection_error",
+            },
+        )
 
     finally:
         # Cleanup
-        if event_task:
-            event_task.cancel()
-            try:
-                await event_task
-            except asyncio.CancelledError:
-                pass
-
+        await sender.close()
         await session.disconnect()
         active_sessions.discard(session_id)
         logger.info(
-            f"Session cleaned up (session={session_id}, remaining={len(active_sessions)})"
+            "Session cleaned up (session=%s, remaining=%s)",
+            session_id,
+            len(active_sessions),
         )
 
 
-async def handle_client_message(
+async def handle_binary_frame(
     session: VoiceAvatarSession,
-    message: dict,
-    websocket: WebSocket,
-    audio_chunk_count: int,
-) -> int:
+    frame: bytes,
+    sender: ClientSender,
+) -> None:
     """
-    Handle messages from the WebSocket client.
-
-    Args:
-        session: The VoiceLive session
-        message: The parsed message from client
-        websocket: WebSocket connection for sending notifications
-        audio_chunk_count: Current audio chunk counter (per-connection)
+    Handle a binary WebSocket frame from the client.
 
-    Returns:
-        Updated audio_chunk_count
+    The first byte selects the frame type (BINARY_FRAME_AUDIO or
+    BINARY_FRAME_SDP); the remainder is the raw payload.
     """
-    msg_type = message.get("type")
+    frame_type = frame[0] if frame else None
+    # Zero-copy view of the payload; base64 encoding and decoding read it directly
+    payload = memoryview(frame)[1:]
+
+    if frame_type == BINARY_FRAME_AUDIO:
+        if not payload:
+            return
+        if len(payload) > MAX_AUDIO_CHUNK_BYTES:
+            error = f"Data exceeds maximum size ({len(payload)} > {MAX_AUDIO_CHUNK_BYTES})"
+            logger.warning("Invalid audio data: %s", error)
+            sender.send(
+                {
+                    "type": "error",
+                    "message": f"Invalid audio data: {error}",
+                    "code": "invalid_audio",
+                },
+            )
+            return
+
+        # Log periodically to avoid spam (every 100 chunks = ~17 seconds at 4096 samples/24kHz)
+        chunk_number = next(session.audio_chunk_counter)
+        if chunk_number % 100 == 1 and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Audio streaming... (chunk #%d, size: %d bytes)",
+                chunk_number,
+                len(payload),
+            )
+
+        # Send audio and notify client if dropped
+        if not await session.send_audio_bytes(payload):
+            sender.send(
+                {"type": "audio.dropped", "reason": "session_not_ready"},
+            )
+        return
+
+    if frame_type == BINARY_FRAME_SDP:
+        try:
+            client_sdp = str(payload, "utf-8")
+        except UnicodeDecodeError:
+            client_sdp = ""
+        await _forward_avatar_sdp(session, client_sdp, sender)
+        return
+
+    logger.warning("Unknown binary frame type: %s", frame_type)
 
-    if msg_type == "audio":
-        # Audio data as base64
-        audio_data = message.get("data")
-        if audio_data:
-            # Validate audio data
-            is_valid, error = validate_base64_data(audio_data, MAX_AUDIO_CHUNK_SIZE)
-            if not is_valid:
-                logger.warning(f"Invalid audio data: {error}")
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "message": f"Invalid audio data: {error}",
-                        "code": "invalid_audio",
-                    }
-                )
-                return audio_chunk_count
-
-            # Log periodically to avoid spam (every 100 chunks = ~17 seconds at 4096 samples/24kHz)
-            audio_chunk_count += 1
-            if audio_chunk_count % 100 == 1:
-                logger.info(
-                    f"Audio streaming... (chunk #{audio_chunk_count}, size: {len(audio_data)} chars)"
-                )
-
-            # Send audio and notify client if dropped
-            audio_sent = await session.send_audio(audio_data)
-            if not audio_sent:
-                await websocket.send_json(
-                    {"type": "audio.dropped", "reason": "session_not_ready"}
-                )
-
-    elif msg_type == "avatar.sdp":
-        # Client SDP for avatar WebRTC
-        client_sdp = message.get("sdp")
-        if client_sdp:
-            # Validate SDP size
-            if len(client_sdp) > MAX_SDP_SIZE:
-                logger.warning(
-                    f"SDP exceeds maximum size: {len(client_sdp)} > {MAX_SDP_SIZE}"
-                )
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "message": "SDP exceeds maximum allowed size",
-                        "code": "invalid_sdp",
-                    }
-                )
-                return audio_chunk_count
 
+async def _handle_audio(
+    session: VoiceAvatarSession, message: dict, sender: ClientSender
+) -> None:
+    """Forward a base64 audio chunk to VoiceLive."""
+    audio_data = message.get("data")
+    if audio_data:
+        # Validate audio data
+        is_valid, error = validate_base64_data(audio_data, MAX_AUDIO_CHUNK_SIZE)
+        if not is_valid:
+            logger.warning("Invalid audio data: %s", error)
+            sender.send(
+                {
+                    "type": "error",
+                    "message": f"Invalid audio data: {error}",
+                    "code": "invalid_audio",
+                },
+            )
+            return
+
+        # Log periodically to avoid spam (every 100 chunks = ~17 seconds at 4096 samples/24kHz)
+        chunk_number = next(session.audio_chunk_counter)
+        if chunk_number % 100 == 1 and logger.isEnabledFor(logging.INFO):
             logger.info(
-                f"Received client SDP for avatar (length: {len(client_sdp)} chars)"
+                "Audio streaming... (chunk #%d, size: %d chars)",
+                chunk_number,
+                len(audio_data),
             )
-            await session.send_avatar_sdp(client_sdp)
-        else:
-            logger.warning(
-                "Received avatar.sdp message but 'sdp' field is missing/empty"
+
+        # Send audio and notify client if dropped
+        audio_sent = await session.send_audio(audio_data)
+        if not audio_sent:
+            sender.send(
+                {"type": "audio.dropped", "reason": "session_not_ready"},
             )
 
-    elif msg_type == "text.input":
-        # Text input from client
-        text_content = message.get("text", "").strip()
-        if text_content:
-            # Validate text length
-            if len(text_content) > MAX_TEXT_INPUT_SIZE:
-                logger.warning(
-                    f"Text input exceeds maximum size: {len(text_content)} > {MAX_TEXT_INPUT_SIZE}"
-                )
-                await websocket.send_json(
-                    {
-                        "type": "error",
-                        "message": "Text input exceeds maximum allowed size",
-                        "code": "text_too_long",
-                    }
-                )
-                return audio_chunk_count
-
-            logger.info(f"Received text input (length: {len(text_content)} chars)")
-            text_sent = await session.send_text_input(text_content)
-            if not text_sent:
-                await websocket.send_json(
-                    {"type": "text.dropped", "reason": "session_not_ready"}
-                )
-        else:
+
+async def _handle_avatar_sdp(
+    session: VoiceAvatarSession, message: dict, sender: ClientSender
+) -> None:
+    """Forward the client SDP offer for the avatar WebRTC connection."""
+    await _forward_avatar_sdp(session, message.get("sdp"), sender)
+
+
+async def _forward_avatar_sdp(
+    session: VoiceAvatarSession, client_sdp: Optional[str], sender: ClientSender
+) -> None:
+    """Validate and forward a client SDP offer (from a JSON or binary frame)."""
+    if client_sdp:
+        # Validate SDP size
+        if len(client_sdp) > MAX_SDP_SIZE:
             logger.warning(
-                "Received text.input message but 'text' field is missing/empty"
+                "SDP exceeds maximum size: %s > %s", len(client_sdp), MAX_SDP_SIZE
             )
-
-    elif msg_type == "response.trigger":
-        # Manually trigger assistant response (for turn-based mode)
-        logger.info("Received response.trigger request")
-        triggered = await session.trigger_response()
-        if not triggered:
-            await websocket.send_json(
+            sender.send(
                 {
                     "type": "error",
-                    "message": "Failed to trigger response",
-                    "code": "trigger_failed",
-                }
+                    "message": "SDP exceeds maximum allowed size",
+                    "code": "invalid_sdp",
+                },
+            )
+            return
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Received client SDP for avatar (length: %d chars)", len(client_sdp)
             )
+        await session.send_avatar_sdp(client_sdp)
+    else:
+        logger.warning("Received avatar.sdp message but 'sdp' field is missing/empty")
+
 
-    elif msg_type == "mode.set":
-        # Switch between turn-based and live voice mode
-        turn_based = message.get("turn_based", False)
-        logger.info(f"Received mode.set request: turn_based={turn_based}")
-        success = await session.set_mode(turn_based)
-        if success:
-            await websocket.send_json(
-                {"type": "mode.updated", "turn_based": turn_based}
+async def _handle_text_input(
+    session: VoiceAvatarSession, message: dict, sender: ClientSender
+) -> None:
+    """Send typed text input to the assistant."""
+    text_content = message.get("text", "").strip()
+    if text_content:
+        # Validate text length
+        if len(text_content) > MAX_TEXT_INPUT_SIZE:
+            logger.warning(
+                "Text input exceeds maximum size: %s > %s",
+                len(text_content),
+                MAX_TEXT_INPUT_SIZE,
             )
-        else:
-            await websocket.send_json(
+            sender.send(
                 {
                     "type": "error",
-                    "message": "Failed to update mode",
-                    "code": "mode_update_failed",
-                }
+                    "message": "Text input exceeds maximum allowed size",
+                    "code": "text_too_long",
+                },
             )
+            return
 
+        logger.info("Received text input (length: %s chars)", len(text_content))
+        text_sent = await session.send_text_input(text_content)
+        if not text_sent:
+            sender.send(
+                {"type": "text.dropped", "reason": "session_not_ready"},
+            )
     else:
-        logger.warning(f"Unknown message type: {msg_type}")
+        logger.warning("Received text.input message but 'text' field is missing/empty")
+
+
+async def _handle_response_trigger(
+    session: VoiceAvatarSession, message: dict, sender: ClientSender
+) -> None:
+    """Manually trigger an assistant response (turn-based mode)."""
+    logger.info("Received response.trigger request")
+    triggered = await session.trigger_response()
+    if not triggered:
+        sender.send(
+            {
+                "type": "error",
+                "message": "Failed to trigger response",
+                "code": "trigger_failed",
+            },
+        )
+
+
+async def _handle_mode_set(
+    session: VoiceAvatarSession, message: dict, sender: ClientSender
+) -> None:
+    """Switch between turn-based and live voice mode."""
+    turn_based = message.get("turn_based", False)
+    logger.info("Received mode.set request: turn_based=%s", turn_based)
+    success = await session.set_mode(turn_based)
+    if success:
+        sender.send(
+            {"type": "mode.updated", "turn_based": turn_based},
+        )
+    else:
+        sender.send(
+            {
+                "type": "error",
+                "message": "Failed to update mode",
+                "code": "mode_update_failed",
+            },
+        )
+
+
+# Client message type -> handler; looked up once per message in handle_client_message
+_MESSAGE_HANDLERS = {
+    "audio": _handle_audio,
+    "avatar.sdp": _handle_avatar_sdp,
+    "text.input": _handle_text_input,
+    "response.trigger": _handle_response_trigger,
+    "mode.set": _handle_mode_set,
+}
 
-    return audio_chunk_count
+
+async def handle_client_message(
+    session: VoiceAvatarSession,
+    message: dict,
+    sender: ClientSender,
+) -> None:
+    """
+    Handle messages from the WebSocket client.
+
+    Args:
+        session: The VoiceLive session
+        message: The parsed message from client
+        sender: Outbound queue for sending notifications to the client
+    """
+    # Dedupe repeated context lookups made while handling this message
+    new_request_scope()
+    msg_type = message.get("type")
+
+    handler = _MESSAGE_HANDLERS.get(msg_type)
+    if handler is None:
+        logger.warning("Unknown message type: %s", msg_type)
+        return
+    await handler(session, message, sender)
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",  # Same loop as the Dockerfile; uvloop ships with uvicorn[standard]
+        ws_max_size=WS_MAX_SIZE,
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE,
+    )
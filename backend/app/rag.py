@@ -9,12 +9,18 @@ import logging
 from typing import Optional
 
 from azure.core.credentials import AzureKeyCredential
-from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient
 
+from .cache import ResponseCache
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Repeated queries reuse recent search hits instead of another round-trip;
+# the TTL keeps index updates from being masked for long
+RAG_CACHE_MAX_ENTRIES = 256
+RAG_CACHE_TTL_SECONDS = 300.0
+
 
 class RAGRetriever:
     """
@@ -27,6 +33,7 @@ class RAGRetriever:
     def __init__(self):
         self._client: Optional[SearchClient] = None
         self._initialized = False
+        self._cache = ResponseCache(RAG_CACHE_MAX_ENTRIES, RAG_CACHE_TTL_SECONDS)
 
     @property
     def enabled(self) -> bool:
@@ -53,13 +60,13 @@ class RAGRetriever:
         ):
             logger.warning("RAG enabled but missing Azure Search configuration")
             logger.warning(
-                f"  Endpoint: {'set' if settings.AZURE_SEARCH_ENDPOINT else 'MISSING'}"
+                "  Endpoint: %s", "set" if settings.AZURE_SEARCH_ENDPOINT else "MISSING"
             )
             logger.warning(
-                f"  API Key: {'set' if settings.AZURE_SEARCH_API_KEY else 'MISSING'}"
+                "  API Key: %s", "set" if settings.AZURE_SEARCH_API_KEY else "MISSING"
             )
             logger.warning(
-                f"  Index: {'set' if settings.AZURE_SEARCH_INDEX else 'MISSING'}"
+                "  Index: %s", "set" if settings.AZURE_SEARCH_INDEX else "MISSING"
             )
             return False
 
@@ -71,13 +78,13 @@ class RAGRetriever:
                 credential=credential,
             )
             self._initialized = True
-            logger.info(f"RAG initialized with index: {settings.AZURE_SEARCH_INDEX}")
+            logger.info("RAG initialized with index: %s", settings.AZURE_SEARCH_INDEX)
             return True
         except Exception as e:
-            logger.error(f"Failed to initialize RAG: {e}")
+            logger.error("Failed to initialize RAG: %s", e)
             return False
 
-    def retrieve(self, query: str, top_k: Optional[int] = None) -> list[dict]:
+    async def retrieve(self, query: str, top_k: Optional[int] = None) -> list[dict]:
         """
         Retrieve relevant documents for the given query.
 
@@ -94,16 +101,22 @@ class RAGRetriever:
         if not query or not query.strip():
             return []
 
+        k = top_k or settings.RAG_TOP_K
+        cache_key = (ResponseCache.normalize(query), k)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug("RAG cache hit for query: %s...", query[:50])
+            return list(cached)
+
         try:
-            k = top_k or settings.RAG_TOP_K
-            results = self._client.search(
+            results = await self._client.search(
                 search_text=query,
                 top=k,
                 select=["content", "title"],  # Adjust field names as needed
             )
 
             documents = []
-            for result in results:
+            async for result in results:
                 doc = {
                     "content": result.get("content", ""),
                     "title": result.get("title", ""),
@@ -114,14 +127,25 @@ class RAGRetriever:
                     documents.append(doc)
 
             logger.info(
-                f"RAG retrieved {len(documents)} documents for query: {query[:50]}..."
+                "RAG retrieved %d documents for query: %s...",
+                len(documents),
+                query[:50],
             )
-            return documents
+            self._cache.put(cache_key, documents)
+            return list(documents)
 
         except Exception as e:
-            logger.error(f"RAG retrieval error: {e}")
+            logger.error("RAG retrieval error: %s", e)
             return []
 
+    async def close(self) -> None:
+        """Close the search client (call on shutdown)."""
+        if self._client:
+            await self._client.close()
+            self._client = None
+        self._cache.clear()
+        self._initialized = False
+
     def format_context(self, documents: list[dict], max_length: int = 1000) -> str:
         """
         Format retrieved documents as context string for instruction injection.
@@ -136,24 +160,24 @@ class RAGRetriever:
         if not documents:
             return ""
 
-        context_parts = ["Use the following information to help answer the question:"]
-        total_length = len(context_parts[0])
+        header = "Use the following information to help answer the question:"
+        context_parts = [header]
+        total_length = len(header)
 
         for i, doc in enumerate(documents, 1):
-            title = doc.get("title", f"Document {i}")
-            content = doc.get("content", "")
-
             # Truncate content if needed
             available = max_length - total_length - 50  # Reserve space for formatting
             if available <= 0:
                 break
 
+            title = doc.get("title", f"Document {i}")
+            content = doc.get("content", "")
             if len(content) > available:
                 content = content[:available] + "..."
 
-            part = f"\n\n[{title}]\n{content}"
-            context_parts.append(part)
-            total_length += len(part)
+            context_parts.append(f"\n\n[{title}]\n{content}")
+            # "\n\n[" + "]\n" adds 5 characters around title and content
+            total_length += len(title) + len(content) + 5
 
         return "".join(context_parts)
 
@@ -7,11 +7,17 @@ including avatar video streaming configuration.
 
 import asyncio
 import base64
-import json
+import binascii
+import itertools
 import logging
+import re
 import time
-from typing import AsyncGenerator, Optional, Union, Any
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
+from typing import AsyncGenerator, Coroutine, Mapping, Optional, Union, Any
 
+import orjson
 from azure.core.credentials import AzureKeyCredential, TokenCredential
 from azure.identity import DefaultAzureCredential
 from azure.ai.voicelive.aio import connect, VoiceLiveConnection
@@ -28,6 +34,9 @@ from azure.ai.voicelive.models import (
     AudioNoiseReduction,
 )
 
+# SIMD-accelerated base64 for the per-chunk audio encode
+from pybase64 import b64encode_as_string as _b64encode
+
 from .config import settings
 from .foundry_agent import foundry_agent
 
@@ -36,13 +45,43 @@ logger = logging.getLogger(__name__)
 
 # Cantonese-specific characters (common in Cantonese but rare in Mandarin)
 CANTONESE_MARKERS = set("係嘅喺冇嚟嗰啲咁噉咗乜嘢")
+_CANTONESE_RE = re.compile("[" + "".join(sorted(CANTONESE_MARKERS)) + "]")
 
 # Common Malay words for detection
 MALAY_INDICATORS = {"saya", "anda", "dia", "kami", "dan", "atau", "yang", "ini", "itu"}
 
 
+# Script ranges scanned in one C-level regex search; the matching group
+# number maps to the language code
+_SCRIPT_RE = re.compile(
+    "([\u4E00-\u9FFF])"  # Chinese (CJK Unified Ideographs)
+    "|([\u0B80-\u0BFF])"  # Tamil
+    "|([\u3040-\u30FF])"  # Japanese Hiragana/Katakana
+    "|([\uAC00-\uD7AF\u1100-\u11FF])"  # Korean Hangul
+)
+_SCRIPT_LANGS = {1: "ZH", 2: "TA", 3: "JA", 4: "KO"}
+
+
+@lru_cache(maxsize=1)
+def _shared_credential() -> Union[AzureKeyCredential, TokenCredential]:
+    """
+    Return the process-wide VoiceLive credential (created on first use).
+
+    Credentials are safe for concurrent use, so every session shares one
+    instead of re-probing the DefaultAzureCredential chain on each connect.
+    """
+    if settings.USE_TOKEN_CREDENTIAL:
+        return DefaultAzureCredential()
+    return AzureKeyCredential(settings.VOICELIVE_API_KEY)
+
+
+@lru_cache(maxsize=512)
 def detect_language(text: str) -> str:
-    """Detect language from text using Unicode character ranges and word patterns."""
+    """
+    Detect language from text using Unicode character ranges and word patterns.
+
+    Memoized by text, since short utterances ("yes", "thank you") repeat often.
+    """
     if not text:
         return "EN"
 
@@ -51,42 +90,42 @@ def detect_language(text: str) -> str:
     if len(words & MALAY_INDICATORS) >= 2:
         return "MS"
 
-    for char in text:
-        code = ord(char)
-        # Chinese (CJK Unified Ideographs)
-        if 0x4E00 <= code <= 0x9FFF:
-            # Check for Cantonese-specific markers
-            canto_count = sum(1 for c in text if c in CANTONESE_MARKERS)
-            return "ZH-HK" if canto_count >= 2 else "ZH"
-        # Tamil
-        if 0x0B80 <= code <= 0x0BFF:
-            return "TA"
-        # Japanese Hiragana/Katakana
-        if 0x3040 <= code <= 0x30FF:
-            return "JA"
-        # Korean Hangul
-        if 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF:
-            return "KO"
-
-    # Default to English for Latin text
-    return "EN"
+    # The first character from any of the scripts decides the language
+    match = _SCRIPT_RE.search(text)
+    if match is None:
+        # Default to English for Latin text
+        return "EN"
+    lang = _SCRIPT_LANGS[match.lastindex]
+    if lang == "ZH":
+        # Check for Cantonese-specific markers
+        canto_count = len(_CANTONESE_RE.findall(text))
+        return "ZH-HK" if canto_count >= 2 else "ZH"
+    return lang
 
 
 # Error codes that are expected during normal operation and should not be forwarded to client
 # These typically occur due to race conditions that are inherent to real-time voice interactions
-EXPECTED_ERROR_CODES = {
-    "response_cancel_not_active",  # User interrupted after response already completed
-    "conversation_already_has_active_response",  # Overlapping speech events from noise/rapid input
-}
+EXPECTED_ERROR_CODES = frozenset(
+    {
+        "response_cancel_not_active",  # User interrupted after response already completed
+        "conversation_already_has_active_response",  # Overlapping speech events from noise/rapid input
+    }
+)
 
 # Rate limit protection: minimum seconds between RAG context retrieval calls
 CONTEXT_DEBOUNCE_SECONDS = 2.0
+# How long a text turn waits for RAG context before starting the response anyway
+TEXT_CONTEXT_WAIT_SECONDS = 2.0
+
+
+_SDP_OFFER_PREFIX = b'{"type":"offer","sdp":'
 
 
 def _encode_client_sdp(client_sdp: str) -> str:
     """Encode SDP as base64 JSON for Azure VoiceLive avatar."""
-    payload = json.dumps({"type": "offer", "sdp": client_sdp})
-    return base64.b64encode(payload.encode("utf-8")).decode("ascii")
+    # orjson only escapes the SDP string; the constant envelope is spliced around it
+    payload = _SDP_OFFER_PREFIX + orjson.dumps(client_sdp) + b"}"
+    return _b64encode(payload)
 
 
 def _decode_server_sdp(server_sdp_raw: Optional[str]) -> Optional[str]:
@@ -96,23 +135,65 @@ def _decode_server_sdp(server_sdp_raw: Optional[str]) -> Optional[str]:
     # Already plain SDP (starts with version line)
     if server_sdp_raw.startswith("v=0"):
         return server_sdp_raw
+    # base64 JSON starts with "ey" (the encoding of '{'); anything else can't be
+    # the JSON envelope, so skip the decode attempt entirely
+    if not server_sdp_raw.startswith("ey"):
+        return server_sdp_raw
+    # Padded base64 is ASCII in whole 4-char groups; otherwise return as-is
+    if len(server_sdp_raw) & 3 or not server_sdp_raw.isascii():
+        return server_sdp_raw
     try:
-        decoded_bytes = base64.b64decode(server_sdp_raw)
-        decoded_text = decoded_bytes.decode("utf-8")
-        payload = json.loads(decoded_text)
-        if isinstance(payload, dict) and "sdp" in payload:
-            return payload["sdp"]
-        return decoded_text
-    except Exception:
-        # If decoding fails, return as-is
+        decoded_bytes = base64.b64decode(server_sdp_raw, validate=True)
+        payload = orjson.loads(decoded_bytes)
+    except (binascii.Error, orjson.JSONDecodeError):
+        # Not base64 JSON after all; return as-is
         return server_sdp_raw
+    if isinstance(payload, dict) and "sdp" in payload:
+        return payload["sdp"]
+    # orjson only accepts valid UTF-8, so this decode cannot fail
+    return decoded_bytes.decode("utf-8")
 
 
 # Timeout constants for Azure SDK operations
 SESSION_UPDATE_TIMEOUT = 15.0  # Timeout for session.update()
 SEND_TIMEOUT = 10.0  # Timeout for connection.send() calls
 DISCONNECT_TIMEOUT = 5.0  # Timeout for disconnect operations
-EVENT_QUEUE_MAXSIZE = 100  # Prevent unbounded memory growth
+
+# Largest VoiceLive server event we accept. Audio deltas and the SDP answer are
+# well under this; anything larger closes the connection (1009) instead of
+# buffering megabytes per session.
+VOICELIVE_MAX_MSG_SIZE = 256 * 1024
+
+# Constant client events, shared read-only across sends (the SDK accepts any Mapping)
+_RESPONSE_CREATE = MappingProxyType({"type": "response.create"})
+
+# Session configs keyed by turn-based mode. They depend only on settings, so
+# each variant is built on first connect and shared by later sessions.
+_SESSION_CONFIGS: dict[bool, RequestSession] = {}
+# set_mode() session.update events keyed by turn-based mode, cached the same way
+_MODE_UPDATES: dict[bool, Mapping[str, Any]] = {}
+
+
+def _build_mode_update(turn_based: bool) -> Mapping[str, Any]:
+    """Build the read-only session.update event that switches turn detection."""
+    # Silence duration: use config value for live mode, 800ms for turn-based mode
+    silence_ms = 800 if turn_based else settings.VAD_SILENCE_DURATION_MS
+    turn_detection_config = {
+        "type": "azure_semantic_vad_multilingual",
+        "threshold": settings.VAD_THRESHOLD,
+        "prefix_padding_ms": settings.VAD_PREFIX_PADDING_MS,
+        "silence_duration_ms": silence_ms,
+        "create_response": not turn_based,
+        "end_of_utterance_detection": {
+            "type": "azure_semantic_detection_multilingual",
+            "threshold_level": settings.EOU_THRESHOLD_LEVEL,
+            "timeout_ms": settings.EOU_TIMEOUT_MS,
+        },
+        "remove_filler_words": settings.VAD_REMOVE_FILLER_WORDS,
+    }
+    return MappingProxyType(
+        {"type": "session.update", "session": {"turn_detection": turn_detection_config}}
+    )
 
 
 class VoiceAvatarSession:
@@ -127,32 +208,50 @@ class VoiceAvatarSession:
     - Turn-based vs live voice mode switching
     """
 
+    __slots__ = (
+        "connection",
+        "_connection_cm",
+        "_session_ready_event",
+        "avatar_ice_servers",
+        "_response_in_progress",
+        "_turn_based_mode",
+        "_base_instructions",
+        "_background_tasks",
+        "_context_semaphore",
+        "_last_context_time",
+        "_last_context_query",
+        "_foundry_thread_id",
+        "_recent_user_messages",
+        "_current_voice",
+        "_foundry_response_pending",
+        "audio_chunk_counter",
+    )
+
     def __init__(self):
         self.connection: Optional[VoiceLiveConnection] = None
         self._connection_cm = None  # Store context manager for proper cleanup
         # Use asyncio.Event for thread-safe session ready signaling
         self._session_ready_event = asyncio.Event()
         self.avatar_ice_servers: list[dict] = []
-        # Bound queue to prevent memory growth if client disconnects
-        self._event_queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
         self._response_in_progress = False
         self._turn_based_mode = settings.TURN_BASED_MODE
         self._base_instructions = settings.ASSISTANT_INSTRUCTIONS
         self._background_tasks: set[asyncio.Task] = set()  # Track background tasks
         # Rate limit protection for RAG context retrieval
         self._context_semaphore = asyncio.Semaphore(1)  # Max 1 concurrent context call
-        self._last_context_time = 0.0
-        self._last_context_query = ""
+        self._last_context_time = 0.0  # time.monotonic() of the last context call
+        self._last_context_query = ""  # Stored normalized (stripped, lowercased)
         # Session-based Foundry Agent thread management
         self._foundry_thread_id: Optional[str] = None
-        self._recent_user_messages: list[str] = []  # Last 3 messages for context
+        # Last 3 messages for context (ring buffer: the oldest drops off on append)
+        self._recent_user_messages: deque[str] = deque(maxlen=3)
         # Track current voice for per-language switching
         self._current_voice: str = settings.VOICE_NAME
         # Guard against concurrent Foundry Agent responses
         # Prevents "conversation_already_has_active_response" errors from overlapping speech
         self._foundry_response_pending: bool = False
-        # Initialize Foundry Agent if enabled
-        foundry_agent.initialize()
+        # Numbers incoming audio chunks for periodic streaming logs
+        self.audio_chunk_counter = itertools.count(1)
 
     @property
     def session_ready(self) -> bool:
@@ -168,13 +267,13 @@ class VoiceAvatarSession:
         self._session_ready_event.clear()
 
     async def _send_with_timeout(
-        self, message: dict, timeout: float = SEND_TIMEOUT
+        self, message: Mapping[str, Any], timeout: float = SEND_TIMEOUT
     ) -> bool:
         """
         Send a message to VoiceLive with timeout protection.
 
         Args:
-            message: The message dict to send
+            message: The client event to send (any mapping)
             timeout: Timeout in seconds (default: SEND_TIMEOUT)
 
         Returns:
@@ -192,18 +291,18 @@ class VoiceAvatarSession:
             return True
         except asyncio.TimeoutError:
             logger.error(
-                f"Send timed out after {timeout}s for message type: {message.get('type', 'unknown')}"
+                "Send timed out after %ss for message type: %s",
+                timeout,
+                message.get("type", "unknown"),
             )
             return False
         except Exception as e:
-            logger.error(f"Send failed: {e}")
+            logger.error("Send failed: %s", e)
             return False
 
     def _get_credential(self) -> Union[AzureKeyCredential, TokenCredential]:
         """Get the appropriate credential based on configuration."""
-        if settings.USE_TOKEN_CREDENTIAL:
-            return DefaultAzureCredential()
-        return AzureKeyCredential(settings.VOICELIVE_API_KEY)
+        return _shared_credential()
 
     def _build_session_config(self) -> RequestSession:
         """Build the session configuration with avatar settings."""
@@ -265,16 +364,10 @@ class VoiceAvatarSession:
         # Input transcription with multi-language auto-detection
         # Supports: whisper-1, gpt-4o-transcribe, gpt-4o-mini-transcribe, azure-speech
         # azure-speech recommended for multilingual (supports Cantonese, phrase lists)
-        phrase_list = None
-        if settings.PHRASE_LIST:
-            phrase_list = [
-                p.strip() for p in settings.PHRASE_LIST.split(",") if p.strip()
-            ]
-
         input_transcription = AudioInputTranscriptionOptions(
             model=settings.TRANSCRIPTION_MODEL,
             language=settings.INPUT_LANGUAGES,  # e.g., "en,zh,zh-HK" for auto-detection
-            phrase_list=phrase_list,  # Only used with azure-speech
+            phrase_list=list(settings.phrase_list) or None,  # Only used with azure-speech
         )
 
         # Avatar enabled - requires resource in supported region
@@ -301,7 +394,7 @@ class VoiceAvatarSession:
         Returns:
             dict with session info including ICE servers for avatar WebRTC
         """
-        logger.info(f"Connecting to VoiceLive at {settings.VOICELIVE_ENDPOINT}")
+        logger.info("Connecting to VoiceLive at %s", settings.VOICELIVE_ENDPOINT)
 
         credential = self._get_credential()
 
@@ -311,7 +404,7 @@ class VoiceAvatarSession:
             credential=credential,
             model=settings.VOICELIVE_MODEL,
             connection_options={
-                "max_msg_size": 10 * 1024 * 1024,
+                "max_msg_size": VOICELIVE_MAX_MSG_SIZE,
                 "heartbeat": 20,
                 "timeout": 20,
             },
@@ -319,10 +412,15 @@ class VoiceAvatarSession:
         self.connection = await self._connection_cm.__aenter__()
 
         # Configure session with avatar
-        session_config = self._build_session_config()
+        session_config = _SESSION_CONFIGS.get(self._turn_based_mode)
+        if session_config is None:
+            session_config = self._build_session_config()
+            _SESSION_CONFIGS[self._turn_based_mode] = session_config
         logger.info(
-            f"Session config: voice={settings.VOICE_NAME}, "
-            f"input_langs={settings.INPUT_LANGUAGES}, max_tokens={settings.MAX_RESPONSE_TOKENS}"
+            "Session config: voice=%s, input_langs=%s, max_tokens=%s",
+            settings.VOICE_NAME,
+            settings.INPUT_LANGUAGES,
+            settings.MAX_RESPONSE_TOKENS,
         )
         # Add timeout to prevent hanging if Azure doesn't respond
         try:
@@ -331,17 +429,20 @@ class VoiceAvatarSession:
                 timeout=SESSION_UPDATE_TIMEOUT,
             )
         except asyncio.TimeoutError:
-            logger.error(f"Session update timed out after {SESSION_UPDATE_TIMEOUT}s")
+            logger.error("Session update timed out after %ss", SESSION_UPDATE_TIMEOUT)
             raise RuntimeError("Session configuration timed out")
 
         logger.info("VoiceLive session configured, waiting for session.updated event")
 
         # Create Foundry Agent thread for this session (if enabled)
+        # initialize() is a no-op once the lifespan handler has set it up
+        await foundry_agent.initialize()
         if foundry_agent.enabled:
-            self._foundry_thread_id = foundry_agent.create_thread()
+            self._foundry_thread_id = await foundry_agent.create_thread()
             if self._foundry_thread_id:
                 logger.info(
-                    f"Created Foundry Agent thread for session: {self._foundry_thread_id}"
+                    "Created Foundry Agent thread for session: %s",
+                    self._foundry_thread_id,
                 )
 
         return {"status": "connecting"}
@@ -361,6 +462,18 @@ class VoiceAvatarSession:
             return False
         return False
 
+    async def send_audio_bytes(self, audio: bytes | memoryview) -> bool:
+        """
+        Send raw PCM16 audio (from a binary WebSocket frame) to VoiceLive.
+
+        The SDK's input_audio_buffer.append takes base64 text, so this is the
+        only place binary audio gets encoded.
+
+        Returns:
+            True if audio was sent, False if dropped (session not ready)
+        """
+        return await self.send_audio(_b64encode(audio))
+
     async def send_text_input(self, text: str) -> bool:
         """
         Send text input to VoiceLive as a user message.
@@ -381,12 +494,14 @@ class VoiceAvatarSession:
             return False
 
         try:
-            logger.info(f"Sending text input: {text[:50]}...")
+            logger.info("Sending text input: %s...", text[:50])
 
             # Track user message for conversation context (keep last 3)
             self._recent_user_messages.append(text)
-            if len(self._recent_user_messages) > 3:
-                self._recent_user_messages.pop(0)
+
+            # Start context retrieval now so it overlaps with sending the message
+            use_agent = self._turn_based_mode and foundry_agent.enabled
+            context_task = None if use_agent else await self._inject_rag_context(text)
 
             # Create user message conversation item
             if not await self._send_with_timeout(
@@ -403,12 +518,22 @@ class VoiceAvatarSession:
                 return False
 
             # In turn-based mode with Foundry Agent, use agent for full response
-            if self._turn_based_mode and foundry_agent.enabled:
+            if use_agent:
                 logger.info("Using Foundry Agent for full response generation")
-                response_text = foundry_agent.process_query(text)
+                # Same shielded timeout as the voice path: a slow run finishes in
+                # the background (filling the response cache) while we fall back.
+                query_task = self._spawn(foundry_agent.process_query(text))
+                try:
+                    response_text = await asyncio.wait_for(
+                        asyncio.shield(query_task),
+                        timeout=15.0,
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning("Foundry Agent text response timed out after 15s")
+                    response_text = None
 
                 if response_text:
-                    logger.info(f"Foundry Agent response: {response_text[:100]}...")
+                    logger.info("Foundry Agent response: %s...", response_text[:100])
                     # Create assistant message with the pre-generated response
                     # VoiceLive will render this as TTS with avatar
                     if not await self._send_with_timeout(
@@ -424,7 +549,7 @@ class VoiceAvatarSession:
                         logger.error("Failed to send assistant message")
                         return False
                     # Trigger response to render the assistant message as audio
-                    if not await self._send_with_timeout({"type": "response.create"}):
+                    if not await self._send_with_timeout(_RESPONSE_CREATE):
                         logger.error("Failed to trigger response")
                         return False
                     return True
@@ -433,16 +558,27 @@ class VoiceAvatarSession:
                     logger.warning(
                         "Foundry Agent returned no response, using VoiceLive fallback"
                     )
+                    context_task = await self._inject_rag_context(text)
 
-            # Default: inject context and let VoiceLive generate response
-            await self._inject_rag_context(text)
-            if not await self._send_with_timeout({"type": "response.create"}):
+            # Default: let VoiceLive generate the response, with context if it
+            # arrives in time (retrieval keeps running in the background otherwise)
+            if context_task:
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(context_task), timeout=TEXT_CONTEXT_WAIT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    logger.info(
+                        "Context not ready after %ss, responding without it",
+                        TEXT_CONTEXT_WAIT_SECONDS,
+                    )
+            if not await self._send_with_timeout(_RESPONSE_CREATE):
                 logger.error("Failed to create response")
                 return False
             return True
 
         except Exception as e:
-            logger.error(f"Error sending text input: {e}")
+            logger.error("Error sending text input: %s", e)
             return False
 
     async def trigger_response(self) -> bool:
@@ -461,12 +597,12 @@ class VoiceAvatarSession:
 
         try:
             logger.info("Manually triggering assistant response")
-            if not await self._send_with_timeout({"type": "response.create"}):
+            if not await self._send_with_timeout(_RESPONSE_CREATE):
                 logger.error("Trigger response timed out")
                 return False
             return True
         except Exception as e:
-            logger.error(f"Error triggering response: {e}")
+            logger.error("Error triggering response: %s", e)
             return False
 
     async def set_mode(self, turn_based: bool) -> bool:
@@ -486,37 +622,21 @@ class VoiceAvatarSession:
         try:
             self._turn_based_mode = turn_based
             logger.info(
-                f"Switching to {'turn-based' if turn_based else 'live voice'} mode"
+                "Switching to %s mode", "turn-based" if turn_based else "live voice"
             )
 
             # Update session turn detection configuration
-            # Silence duration: use config value for live mode, 800ms for turn-based mode
-            silence_ms = 800 if turn_based else settings.VAD_SILENCE_DURATION_MS
-            turn_detection_config = {
-                "type": "azure_semantic_vad_multilingual",
-                "threshold": settings.VAD_THRESHOLD,
-                "prefix_padding_ms": settings.VAD_PREFIX_PADDING_MS,
-                "silence_duration_ms": silence_ms,
-                "create_response": not turn_based,
-                "end_of_utterance_detection": {
-                    "type": "azure_semantic_detection_multilingual",
-                    "threshold_level": settings.EOU_THRESHOLD_LEVEL,
-                    "timeout_ms": settings.EOU_TIMEOUT_MS,
-                },
-                "remove_filler_words": settings.VAD_REMOVE_FILLER_WORDS,
-            }
+            mode_update = _MODE_UPDATES.get(turn_based)
+            if mode_update is None:
+                mode_update = _build_mode_update(turn_based)
+                _MODE_UPDATES[turn_based] = mode_update
 
-            if not await self._send_with_timeout(
-                {
-                    "type": "session.update",
-                    "session": {"turn_detection": turn_detection_config},
-                }
-            ):
+            if not await self._send_with_timeout(mode_update):
                 logger.error("Failed to update session mode")
                 return False
             return True
         except Exception as e:
-            logger.error(f"Error setting mode: {e}")
+            logger.error("Error setting mode: %s", e)
             return False
 
     @property
@@ -560,11 +680,11 @@ class VoiceAvatarSession:
         ):
             self._current_voice = target_voice
             logger.info(
-                f"Switched voice to {target_voice} for language {detected_lang}"
+                "Switched voice to %s for language %s", target_voice, detected_lang
             )
             return True
 
-        logger.warning(f"Failed to switch voice to {target_voice}")
+        logger.warning("Failed to switch voice to %s", target_voice)
         return False
 
     async def _inject_rag_context_background(self, query: str) -> None:
@@ -583,15 +703,18 @@ class VoiceAvatarSession:
             return
 
         # Debounce: skip if called too recently
-        now = time.time()
+        now = time.monotonic()
         if now - self._last_context_time < CONTEXT_DEBOUNCE_SECONDS:
             logger.debug(
-                f"Skipping context retrieval (debounce: {now - self._last_context_time:.1f}s < {CONTEXT_DEBOUNCE_SECONDS}s)"
+                "Skipping context retrieval (debounce: %.1fs < %ss)",
+                now - self._last_context_time,
+                CONTEXT_DEBOUNCE_SECONDS,
             )
             return
 
         # Skip if query is very similar to last one (case-insensitive)
-        if query.strip().lower() == self._last_context_query.strip().lower():
+        normalized_query = query.strip().lower()
+        if normalized_query == self._last_context_query:
             logger.debug("Skipping context retrieval (duplicate query)")
             return
 
@@ -600,24 +723,23 @@ class VoiceAvatarSession:
             async with self._context_semaphore:
                 try:
                     # Update tracking before the call
-                    self._last_context_time = time.time()
-                    self._last_context_query = query
+                    self._last_context_time = now
+                    self._last_context_query = normalized_query
 
                     # Get conversation context (previous messages, excluding current query)
                     # Use all but the last message since last message IS the current query
+                    recent = self._recent_user_messages
                     conversation_context = (
-                        self._recent_user_messages[:-1]
-                        if len(self._recent_user_messages) > 1
+                        list(itertools.islice(recent, len(recent) - 1))
+                        if len(recent) > 1
                         else None
                     )
 
-                    # Run synchronous Foundry Agent call in thread pool to avoid blocking
                     # Pass thread_id for session-based context and conversation history
-                    # Use timeout to prevent thread pool exhaustion if Foundry hangs
+                    # Use timeout so a hanging Foundry call doesn't hold the semaphore
                     try:
                         context = await asyncio.wait_for(
-                            asyncio.to_thread(
-                                foundry_agent.get_context,
+                            foundry_agent.get_context(
                                 query,
                                 thread_id=self._foundry_thread_id,
                                 conversation_context=conversation_context,
@@ -635,7 +757,7 @@ class VoiceAvatarSession:
 
                     augmented_instructions = f"{self._base_instructions}\n\n{context}"
                     logger.info(
-                        f"Injecting Foundry Agent context ({len(context)} chars)"
+                        "Injecting Foundry Agent context (%d chars)", len(context)
                     )
 
                     # Update session with augmented instructions
@@ -649,16 +771,24 @@ class VoiceAvatarSession:
                             logger.warning("Failed to inject RAG context (timeout)")
 
                 except Exception as e:
-                    logger.error(f"Background RAG injection failed: {e}")
+                    logger.error("Background RAG injection failed: %s", e)
         else:
             logger.debug("Skipping context retrieval (another call in progress)")
 
-    def _track_task(self, task: asyncio.Task) -> None:
-        """Track a background task and clean up when done."""
+    def _spawn(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        """
+        Start a background task tracked for cancellation on disconnect.
+
+        The set holds a strong reference: the event loop only keeps weak
+        references to tasks, so an untracked (or weakly tracked) task could be
+        garbage collected mid-flight. Done tasks remove themselves.
+        """
+        task = asyncio.create_task(coro)
         self._background_tasks.add(task)
         task.add_done_callback(self._background_tasks.discard)
+        return task
 
-    async def _inject_rag_context(self, query: str) -> bool:
+    async def _inject_rag_context(self, query: str) -> Optional[asyncio.Task]:
         """
         Fire-and-forget RAG context injection - doesn't block event processing.
 
@@ -666,15 +796,13 @@ class VoiceAvatarSession:
             query: The user's query (transcribed speech or text input)
 
         Returns:
-            True if background task was started, False otherwise
+            The background task if one was started (callers may await it), else None
         """
         if not foundry_agent.enabled:
-            return False
+            return None
 
         # Fire and forget - but track for cleanup on disconnect
-        task = asyncio.create_task(self._inject_rag_context_background(query))
-        self._track_task(task)
-        return True
+        return self._spawn(self._inject_rag_context_background(query))
 
     async def _cancel_response_async(self) -> None:
         """Fire-and-forget response cancellation."""
@@ -683,7 +811,7 @@ class VoiceAvatarSession:
                 await self.connection.response.cancel()
         except Exception as e:
             # Expected errors during cancellation (e.g., response already done)
-            logger.debug(f"Response cancel (expected): {e}")
+            logger.debug("Response cancel (expected): %s", e)
 
     async def _handle_foundry_voice_response(self, transcript: str) -> None:
         """
@@ -697,10 +825,13 @@ class VoiceAvatarSession:
             transcript: The user's transcribed speech
         """
         try:
-            # Get full response from Foundry Agent (blocking call in thread pool)
+            # Get full response from Foundry Agent. The run is shielded so a timeout
+            # here doesn't cancel it: it finishes in the background and its reply
+            # lands in the agent's response cache instead of being thrown away.
+            query_task = self._spawn(foundry_agent.process_query(transcript))
             try:
                 response_text = await asyncio.wait_for(
-                    asyncio.to_thread(foundry_agent.process_query, transcript),
+                    asyncio.shield(query_task),
                     timeout=15.0,
                 )
             except asyncio.TimeoutError:
@@ -708,7 +839,7 @@ class VoiceAvatarSession:
                 response_text = None
 
             if response_text:
-                logger.info(f"Foundry Agent voice response: {response_text[:100]}...")
+                logger.info("Foundry Agent voice response: %s...", response_text[:100])
                 # Create assistant message with the pre-generated response
                 if await self._send_with_timeout(
                     {
@@ -721,7 +852,7 @@ class VoiceAvatarSession:
                     }
                 ):
                     # Trigger response to render the assistant message as TTS
-                    await self._send_with_timeout({"type": "response.create"})
+                    await self._send_with_timeout(_RESPONSE_CREATE)
                 else:
                     logger.error("Failed to send Foundry Agent response to VoiceLive")
             else:
@@ -729,12 +860,12 @@ class VoiceAvatarSession:
                 logger.warning(
                     "Foundry Agent failed, triggering VoiceLive fallback response"
                 )
-                await self._send_with_timeout({"type": "response.create"})
+                await self._send_with_timeout(_RESPONSE_CREATE)
         except Exception as e:
-            logger.error(f"Error handling Foundry voice response: {e}")
+            logger.error("Error handling Foundry voice response: %s", e)
             # Try to trigger fallback response
             try:
-                await self._send_with_timeout({"type": "response.create"})
+                await self._send_with_timeout(_RESPONSE_CREATE)
             except Exception:
                 pass
         finally:
@@ -750,10 +881,10 @@ class VoiceAvatarSession:
             True if sent successfully, False otherwise
         """
         if self.connection:
-            logger.info(f"Sending avatar SDP offer (length: {len(client_sdp)} chars)")
+            logger.info("Sending avatar SDP offer (length: %d chars)", len(client_sdp))
             # Encode SDP as base64 JSON (required by Azure VoiceLive)
             encoded_sdp = _encode_client_sdp(client_sdp)
-            logger.debug(f"Encoded SDP length: {len(encoded_sdp)} chars")
+            logger.debug("Encoded SDP length: %d chars", len(encoded_sdp))
             if await self._send_with_timeout(
                 {
                     "type": "session.avatar.connect",
@@ -785,7 +916,7 @@ class VoiceAvatarSession:
                 if event_data:
                     yield event_data
         except Exception as e:
-            logger.error(f"Error processing events: {e}")
+            logger.error("Error processing events: %s", e)
             yield {"type": "error", "message": str(e)}
 
     async def _handle_event(self, event: Any) -> Optional[dict]:
@@ -793,286 +924,280 @@ class VoiceAvatarSession:
         # Get event type as string - Azure SDK returns strings, not enums
         event_type_str = str(event.type) if event.type else "unknown"
 
-        # Only log non-delta events to reduce noise
-        if "delta" not in event_type_str:
-            logger.info(f"Received event: {event_type_str}")
-
-        # Session events
-        if event_type_str == "session.updated":
-            self._set_session_ready()
-            # Extract ICE servers if provided
-            ice_servers_list = []
-            if hasattr(event, "session") and hasattr(event.session, "avatar"):
-                avatar_info = event.session.avatar
-                if hasattr(avatar_info, "ice_servers") and avatar_info.ice_servers:
-                    for server in avatar_info.ice_servers:
-                        ice_server_dict = {
-                            "urls": server.urls if hasattr(server, "urls") else [],
-                        }
-                        if hasattr(server, "username") and server.username:
-                            ice_server_dict["username"] = server.username
-                        if hasattr(server, "credential") and server.credential:
-                            ice_server_dict["credential"] = server.credential
-                        ice_servers_list.append(ice_server_dict)
-            self.avatar_ice_servers = ice_servers_list
-
-            logger.info(f"Session ready with {len(ice_servers_list)} ICE server(s)")
-            if ice_servers_list:
-                logger.info(f"ICE servers: {ice_servers_list}")
-            return {"type": "session.ready", "ice_servers": self.avatar_ice_servers}
-
-        elif event_type_str == "session.avatar.connecting":
-            # Server SDP for WebRTC (may be base64-encoded JSON)
+        # Only log non-delta events to reduce noise (all delta types end in ".delta")
+        if not event_type_str.endswith(".delta"):
+            logger.info("Received event: %s", event_type_str)
+
+        handler = self._EVENT_HANDLERS.get(event_type_str)
+        if handler is None:
+            # Log unhandled events for debugging
+            logger.debug("Unhandled event type: %s", event_type_str)
+            return None
+        return await handler(self, event)
+
+    # Session events
+    async def _on_session_updated(self, event: Any) -> dict:
+        self._set_session_ready()
+        # Extract ICE servers if provided (urls always; username/credential if set)
+        avatar_info = getattr(getattr(event, "session", None), "avatar", None)
+        ice_servers_list = [
+            {
+                "urls": getattr(server, "urls", []),
+                **{
+                    key: value
+                    for key in ("username", "credential")
+                    if (value := getattr(server, key, None))
+                },
+            }
+            for server in getattr(avatar_info, "ice_servers", None) or ()
+        ]
+        self.avatar_ice_servers = ice_servers_list
+
+        logger.info("Session ready with %d ICE server(s)", len(ice_servers_list))
+        if ice_servers_list:
+            logger.info("ICE servers: %s", ice_servers_list)
+        return {"type": "session.ready", "ice_servers": self.avatar_ice_servers}
+
+    async def _on_avatar_connecting(self, event: Any) -> dict:
+        # Server SDP for WebRTC (may be base64-encoded JSON)
+        server_sdp_raw = getattr(event, "server_sdp", None)
+        logger.info(
+            "Received avatar connecting event. Has server_sdp: %s",
+            server_sdp_raw is not None,
+        )
+        if server_sdp_raw:
             logger.info(
-                f"Received avatar connecting event. Has server_sdp: {hasattr(event, 'server_sdp')}"
+                "Raw server SDP received (length: %d chars)", len(server_sdp_raw)
             )
-            server_sdp_raw = event.server_sdp if hasattr(event, "server_sdp") else None
-            if server_sdp_raw:
-                logger.info(
-                    f"Raw server SDP received (length: {len(server_sdp_raw)} chars)"
-                )
-                # Decode if needed (Azure may return base64-encoded JSON)
-                server_sdp = _decode_server_sdp(server_sdp_raw)
-                logger.info(
-                    f"Decoded server SDP (length: {len(server_sdp) if server_sdp else 0} chars)"
-                )
-            else:
-                logger.error("Avatar connecting event has no server_sdp!")
-                server_sdp = None
-            return {"type": "avatar.sdp", "server_sdp": server_sdp}
-
-        elif event_type_str == "session.avatar.connected":
-            logger.info("Avatar WebRTC connection established")
-            return {"type": "avatar.connected"}
-
-        elif event_type_str in ("session.avatar.error", "session.avatar.failed"):
-            # Avatar connection failed - frontend should fall back to voice-only
-            error_msg = "Avatar connection failed"
-            if hasattr(event, "error"):
-                error_msg = str(event.error)
-            elif hasattr(event, "message"):
-                error_msg = event.message
-            logger.error(f"Avatar error: {error_msg}")
-            return {"type": "avatar.error", "message": error_msg}
-
-        # Voice activity detection events
-        elif event_type_str == "input_audio_buffer.speech_started":
-            logger.info("User started speaking")
-            # If assistant is responding, cancel to allow interruption (fire-and-forget)
-            if self._response_in_progress and self.connection:
-                logger.info("Cancelling in-progress response (user interruption)")
-                # Fire and forget - but track for cleanup on disconnect
-                task = asyncio.create_task(self._cancel_response_async())
-                self._track_task(task)
-                # Immediately mark as cancelled for responsive UI
-                self._response_in_progress = False
-            return {"type": "user.speaking.started"}
-
-        elif event_type_str == "input_audio_buffer.speech_stopped":
-            logger.info("User stopped speaking")
-            return {"type": "user.speaking.stopped"}
-
-        elif event_type_str == "input_audio_buffer.committed":
-            # Audio buffer committed, no action needed
-            return None
+            # Decode if needed (Azure may return base64-encoded JSON)
+            server_sdp = _decode_server_sdp(server_sdp_raw)
+            logger.info(
+                "Decoded server SDP (length: %d chars)",
+                len(server_sdp) if server_sdp else 0,
+            )
+        else:
+            logger.error("Avatar connecting event has no server_sdp!")
+            server_sdp = None
+        return {"type": "avatar.sdp", "server_sdp": server_sdp}
+
+    async def _on_avatar_connected(self, event: Any) -> dict:
+        logger.info("Avatar WebRTC connection established")
+        return {"type": "avatar.connected"}
+
+    async def _on_avatar_error(self, event: Any) -> dict:
+        # Avatar connection failed - frontend should fall back to voice-only
+        error_msg = "Avatar connection failed"
+        error = getattr(event, "error", None)
+        if error is not None:
+            error_msg = str(error)
+        else:
+            error_msg = getattr(event, "message", error_msg)
+        logger.error("Avatar error: %s", error_msg)
+        return {"type": "avatar.error", "message": error_msg}
+
+    # Voice activity detection events
+    async def _on_speech_started(self, event: Any) -> dict:
+        logger.info("User started speaking")
+        # If assistant is responding, cancel to allow interruption (fire-and-forget)
+        if self._response_in_progress and self.connection:
+            logger.info("Cancelling in-progress response (user interruption)")
+            # Fire and forget - but track for cleanup on disconnect
+            self._spawn(self._cancel_response_async())
+            # Immediately mark as cancelled for responsive UI
+            self._response_in_progress = False
+        return {"type": "user.speaking.started"}
 
-        # Transcript events - User speech
-        elif event_type_str == "conversation.item.input_audio_transcription.completed":
-            # User's speech has been transcribed
-            transcript = None
-            if hasattr(event, "transcript"):
-                transcript = event.transcript
-            logger.info(f"User transcript: {transcript}")
-            if transcript and transcript.strip():
-                logger.info(f"Sending user transcript to client: {transcript[:50]}...")
-                # Track user message for conversation context (keep last 3)
-                self._recent_user_messages.append(transcript)
-                if len(self._recent_user_messages) > 3:
-                    self._recent_user_messages.pop(0)
-
-                # Detect language and switch voice if needed
-                detected_lang = detect_language(transcript)
-                await self._switch_voice_for_language(detected_lang)
-
-                # In turn-based mode with Foundry Agent, use agent for full RAG+LLM response
-                # This ensures context is always available before response starts
-                if self._turn_based_mode and foundry_agent.enabled:
-                    # Guard: Skip if a Foundry response is already being processed
-                    # This prevents "conversation_already_has_active_response" errors
-                    # when background noise triggers multiple speech events
-                    if self._foundry_response_pending:
-                        logger.warning(
-                            "Skipping transcript: Foundry response already pending "
-                            f"(transcript: {transcript[:50]}...)"
-                        )
-                        return {
-                            "type": "transcript",
-                            "role": "user",
-                            "text": transcript,
-                            "language": detected_lang,
-                        }
+    async def _on_speech_stopped(self, event: Any) -> dict:
+        logger.info("User stopped speaking")
+        return {"type": "user.speaking.stopped"}
 
-                    logger.info(
-                        "Turn-based mode: Using Foundry Agent for voice response"
-                    )
-                    # Mark response as pending before starting task
-                    self._foundry_response_pending = True
-                    # Start background task to get Foundry Agent response and trigger TTS
-                    # This allows event processing to continue while waiting for the agent
-                    task = asyncio.create_task(
-                        self._handle_foundry_voice_response(transcript)
-                    )
-                    self._track_task(task)
-                    # Return transcript with thinking flag to signal processing started
-                    return {
-                        "type": "transcript",
-                        "role": "user",
-                        "text": transcript,
-                        "language": detected_lang,
-                        "thinking": True,
-                    }
-                else:
-                    # Live voice mode: fire-and-forget RAG context injection
-                    # VoiceLive will auto-trigger response via VAD
-                    await self._inject_rag_context(transcript)
+    async def _on_ignored_event(self, event: Any) -> None:
+        # Acknowledged event with no client-facing effect
+        return None
+
+    # Transcript events - User speech
+    async def _on_user_transcript(self, event: Any) -> Optional[dict]:
+        # User's speech has been transcribed
+        transcript = getattr(event, "transcript", None)
+        logger.info("User transcript: %s", transcript)
+        # isspace() scans without allocating the stripped copy
+        if not transcript or transcript.isspace():
+            return None
 
+        logger.info("Sending user transcript to client: %s...", transcript[:50])
+        # Track user message for conversation context (keep last 3)
+        self._recent_user_messages.append(transcript)
+
+        # Detect language and switch voice if needed
+        detected_lang = detect_language(transcript)
+        await self._switch_voice_for_language(detected_lang)
+
+        # In turn-based mode with Foundry Agent, use agent for full RAG+LLM response
+        # This ensures context is always available before response starts
+        if self._turn_based_mode and foundry_agent.enabled:
+            # Guard: Skip if a Foundry response is already being processed
+            # This prevents "conversation_already_has_active_response" errors
+            # when background noise triggers multiple speech events
+            if self._foundry_response_pending:
+                logger.warning(
+                    "Skipping transcript: Foundry response already pending "
+                    "(transcript: %s...)",
+                    transcript[:50],
+                )
                 return {
                     "type": "transcript",
                     "role": "user",
                     "text": transcript,
                     "language": detected_lang,
                 }
-            return None
-
-        # Response events
-        elif event_type_str == "response.created":
-            logger.info("Assistant response created")
-            self._response_in_progress = True
-            return {"type": "assistant.response.started"}
-
-        elif event_type_str == "response.output_item.added":
-            # Output item added, no action needed
-            return None
-
-        elif event_type_str == "response.content_part.added":
-            # Content part added, no action needed
-            return None
-
-        # Audio streaming events (for voice-only mode without avatar)
-        elif event_type_str == "response.audio.delta":
-            # Forward audio chunks to client for playback
-            audio_data = None
-            if hasattr(event, "delta"):
-                audio_data = event.delta
-            if audio_data:
-                # Convert bytes to base64 string for JSON serialization
-                if isinstance(audio_data, bytes):
-                    audio_data = base64.b64encode(audio_data).decode("utf-8")
-                return {"type": "audio.delta", "data": audio_data}
-            return None
 
-        elif event_type_str == "response.audio.done":
-            logger.info("Assistant audio done")
-            return {"type": "assistant.speaking.done"}
-
-        # Transcript events - Assistant response (streaming)
-        elif event_type_str == "response.audio_transcript.delta":
-            # Forward incremental transcript updates for real-time display
-            delta = getattr(event, "delta", None)
-            if delta:
-                logger.debug(f"Transcript delta: {delta}")
-                return {"type": "transcript.delta", "role": "assistant", "delta": delta}
-            return None
-
-        elif event_type_str == "response.audio_transcript.done":
-            # Complete assistant transcript
-            transcript = None
-            if hasattr(event, "transcript"):
-                transcript = event.transcript
-            logger.info(f"Assistant transcript: {transcript}")
-            if transcript and transcript.strip():
-                logger.info(
-                    f"Sending assistant transcript to client: {transcript[:50]}..."
-                )
-                return {"type": "transcript", "role": "assistant", "text": transcript}
-            return None
-
-        elif event_type_str == "response.content_part.done":
-            # Content part done, no action needed
-            return None
-
-        elif event_type_str == "response.output_item.done":
-            # Output item done, no action needed
-            return None
-
-        elif event_type_str == "response.done":
-            logger.info("Response complete")
-            self._response_in_progress = False
-            return {"type": "assistant.response.done"}
+            logger.info("Turn-based mode: Using Foundry Agent for voice response")
+            # Mark response as pending before starting task
+            self._foundry_response_pending = True
+            # Start background task to get Foundry Agent response and trigger TTS
+            # This allows event processing to continue while waiting for the agent
+            self._spawn(self._handle_foundry_voice_response(transcript))
+            # Return transcript with thinking flag to signal processing started
+            return {
+                "type": "transcript",
+                "role": "user",
+                "text": transcript,
+                "language": detected_lang,
+                "thinking": True,
+            }
 
-        elif event_type_str == "response.cancelled":
-            logger.info("Response cancelled (user interruption)")
-            self._response_in_progress = False
-            return {"type": "assistant.response.cancelled"}
+        # Live voice mode: fire-and-forget RAG context injection
+        # VoiceLive will auto-trigger response via VAD
+        await self._inject_rag_context(transcript)
+        return {
+            "type": "transcript",
+            "role": "user",
+            "text": transcript,
+            "language": detected_lang,
+        }
 
-        # Conversation item events
-        elif event_type_str == "conversation.item.created":
-            # Item created - transcript might be in here for some event types
-            return None
+    # Response events
+    async def _on_response_created(self, event: Any) -> dict:
+        logger.info("Assistant response created")
+        self._response_in_progress = True
+        return {"type": "assistant.response.started"}
+
+    # Audio streaming events (for voice-only mode without avatar)
+    async def _on_audio_delta(self, event: Any) -> Optional[dict]:
+        # Forward audio chunks to client for playback
+        # Raw PCM16 bytes: the WebSocket layer sends them as a binary frame, or
+        # base64-encodes them for JSON clients
+        audio_data = getattr(event, "delta", None)
+        if audio_data:
+            return {"type": "audio.delta", "data": audio_data}
+        return None
 
-        # Error events
-        elif event_type_str == "error":
-            error_msg = "Unknown error"
-            error_code = "unknown"
-            if hasattr(event, "error"):
-                if isinstance(event.error, dict):
-                    error_msg = event.error.get("message", str(event.error))
-                    error_code = event.error.get("code", "unknown")
-                elif hasattr(event.error, "message"):
-                    error_msg = event.error.message
-                    error_code = (
-                        event.error.code if hasattr(event.error, "code") else "unknown"
-                    )
+    async def _on_audio_done(self, event: Any) -> dict:
+        logger.info("Assistant audio done")
+        return {"type": "assistant.speaking.done"}
+
+    # Transcript events - Assistant response (streaming)
+    async def _on_transcript_delta(self, event: Any) -> Optional[dict]:
+        # Forward incremental transcript updates for real-time display
+        delta = getattr(event, "delta", None)
+        if delta:
+            logger.debug("Transcript delta: %s", delta)
+            return {"type": "transcript.delta", "role": "assistant", "delta": delta}
+        return None
 
-            # Filter out expected errors that shouldn't be shown to user
-            if error_code in EXPECTED_ERROR_CODES:
-                logger.debug(f"Ignoring expected error: [{error_code}] {error_msg}")
-                return None  # Don't forward to client
+    async def _on_assistant_transcript(self, event: Any) -> Optional[dict]:
+        # Complete assistant transcript
+        transcript = getattr(event, "transcript", None)
+        logger.info("Assistant transcript: %s", transcript)
+        if transcript and not transcript.isspace():
+            logger.info(
+                "Sending assistant transcript to client: %s...", transcript[:50]
+            )
+            return {"type": "transcript", "role": "assistant", "text": transcript}
+        return None
 
-            logger.error(f"VoiceLive error: [{error_code}] {error_msg}")
-            return {"type": "error", "message": error_msg, "code": error_code}
+    async def _on_response_done(self, event: Any) -> dict:
+        logger.info("Response complete")
+        self._response_in_progress = False
+        return {"type": "assistant.response.done"}
 
-        elif event_type_str == "response.audio_timestamp.delta":
-            # Word-level timestamps for avatar sync
-            return {
-                "type": "audio.timestamp",
-                "text": event.text if hasattr(event, "text") else None,
-                "offset_ms": event.audio_offset_ms
-                if hasattr(event, "audio_offset_ms")
-                else None,
-            }
+    async def _on_response_cancelled(self, event: Any) -> dict:
+        logger.info("Response cancelled (user interruption)")
+        self._response_in_progress = False
+        return {"type": "assistant.response.cancelled"}
+
+    # Error events
+    async def _on_error(self, event: Any) -> Optional[dict]:
+        error_msg = "Unknown error"
+        error_code = "unknown"
+        error = getattr(event, "error", None)
+        if isinstance(error, dict):
+            error_msg = error.get("message", str(error))
+            error_code = error.get("code", "unknown")
+        elif (message := getattr(error, "message", None)) is not None:
+            error_msg = message
+            error_code = getattr(error, "code", "unknown")
+
+        # Filter out expected errors that shouldn't be shown to user
+        if error_code in EXPECTED_ERROR_CODES:
+            logger.debug("Ignoring expected error: [%s] %s", error_code, error_msg)
+            return None  # Don't forward to client
+
+        logger.error("VoiceLive error: [%s] %s", error_code, error_msg)
+        return {"type": "error", "message": error_msg, "code": error_code}
+
+    async def _on_audio_timestamp(self, event: Any) -> dict:
+        # Word-level timestamps for avatar sync
+        return {
+            "type": "audio.timestamp",
+            "text": getattr(event, "text", None),
+            "offset_ms": getattr(event, "audio_offset_ms", None),
+        }
 
-        # Log unhandled events for debugging
-        logger.debug(f"Unhandled event type: {event_type_str}")
-        return None
+    # VoiceLive event type -> handler, looked up once per event in _handle_event
+    _EVENT_HANDLERS = {
+        "session.updated": _on_session_updated,
+        "session.avatar.connecting": _on_avatar_connecting,
+        "session.avatar.connected": _on_avatar_connected,
+        "session.avatar.error": _on_avatar_error,
+        "session.avatar.failed": _on_avatar_error,
+        "input_audio_buffer.speech_started": _on_speech_started,
+        "input_audio_buffer.speech_stopped": _on_speech_stopped,
+        "input_audio_buffer.committed": _on_ignored_event,
+        "conversation.item.input_audio_transcription.completed": _on_user_transcript,
+        "conversation.item.created": _on_ignored_event,
+        "response.created": _on_response_created,
+        "response.output_item.added": _on_ignored_event,
+        "response.content_part.added": _on_ignored_event,
+        "response.audio.delta": _on_audio_delta,
+        "response.audio.done": _on_audio_done,
+        "response.audio_transcript.delta": _on_transcript_delta,
+        "response.audio_transcript.done": _on_assistant_transcript,
+        "response.audio_timestamp.delta": _on_audio_timestamp,
+        "response.content_part.done": _on_ignored_event,
+        "response.output_item.done": _on_ignored_event,
+        "response.done": _on_response_done,
+        "response.cancelled": _on_response_cancelled,
+        "error": _on_error,
+    }
 
     async def disconnect(self) -> None:
         """Disconnect from VoiceLive."""
-        # Cancel all tracked background tasks
-        for task in list(self._background_tasks):
-            if not task.done():
-                task.cancel()
-        # Wait for all tasks to complete cancellation
-        if self._background_tasks:
-            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        # Cancel tracked background tasks that are still running, then wait for
+        # them to finish cancelling (done tasks need neither)
+        pending = [task for task in self._background_tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
         self._background_tasks.clear()
 
         # Delete Foundry Agent thread for this session
         if self._foundry_thread_id:
             try:
-                foundry_agent.delete_thread(self._foundry_thread_id)
+                await foundry_agent.delete_thread(self._foundry_thread_id)
             except Exception as e:
-                logger.warning(f"Failed to delete Foundry thread: {e}")
+                logger.warning("Failed to delete Foundry thread: %s", e)
             finally:
                 self._foundry_thread_id = None
                 self._recent_user_messages.clear()
@@ -1082,7 +1207,7 @@ class VoiceAvatarSession:
             try:
                 await self._connection_cm.__aexit__(None, None, None)
             except Exception as e:
-                logger.error(f"Error exiting connection context: {e}")
+                logger.error("Error exiting connection context: %s", e)
             finally:
                 self._connection_cm = None
                 self.connection = None
@@ -1093,7 +1218,7 @@ class VoiceAvatarSession:
                 if hasattr(self.connection, "close"):
                     await self.connection.close()
             except Exception as e:
-                logger.error(f"Error disconnecting: {e}")
+                logger.error("Error disconnecting: %s", e)
             finally:
                 self.connection = None
                 self._clear_session_ready()
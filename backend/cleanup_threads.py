@@ -4,51 +4,84 @@ Cleanup script to delete all Azure AI Foundry Agent threads.
 Run this once to clean up threads that accumulated before the fix.
 """
 
-import os
-from dotenv import load_dotenv
-from azure.ai.agents import AgentsClient
-from azure.identity import DefaultAzureCredential
-
-# Load environment variables
-load_dotenv()
-
-FOUNDRY_ENDPOINT = os.getenv("FOUNDRY_ENDPOINT")
-
-if not FOUNDRY_ENDPOINT:
-    print("Error: FOUNDRY_ENDPOINT not set in .env")
-    exit(1)
-
-print(f"Connecting to: {FOUNDRY_ENDPOINT}")
-
-client = AgentsClient(
-    endpoint=FOUNDRY_ENDPOINT,
-    credential=DefaultAzureCredential(),
-)
-
-# List all threads
-print("Fetching threads...")
-threads = list(client.threads.list())
-total = len(threads)
-
-if total == 0:
-    print("No threads found. Nothing to clean up.")
-    exit(0)
-
-print(f"Found {total} threads to delete.\n")
-
-# Delete each thread
-deleted = 0
-errors = 0
-
-for thread in threads:
-    try:
-        client.threads.delete(thread.id)
-        deleted += 1
-        print(f"[{deleted}/{total}] Deleted: {thread.id}")
-    except Exception as e:
-        errors += 1
-        print(f"[ERROR] Failed to delete {thread.id}: {e}")
-
-print("\nCleanup complete!")
-print(f"  Deleted: {deleted}")
-print(f"  Errors:  {errors}")
+import asyncio
+from typing import Optional
+
+from azure.ai.agents.aio import AgentsClient
+from azure.identity.aio import DefaultAzureCredential
+
+# Reuse the app's settings so .env is loaded and parsed in one place
+from app.config import settings
+
+FOUNDRY_ENDPOINT = settings.FOUNDRY_ENDPOINT
+# Deletes in flight at once; each one is a single HTTPS round-trip
+MAX_CONCURRENT_DELETES = 32
+# Thread IDs listed per round (the service's maximum page size)
+LIST_PAGE_SIZE = 100
+
+
+async def list_thread_ids(client: AgentsClient, skip: set[str]) -> list[str]:
+    """Return up to one page of thread IDs, ignoring threads that failed to delete."""
+    thread_ids = []
+    async for thread in client.threads.list(limit=LIST_PAGE_SIZE):
+        if thread.id not in skip:
+            thread_ids.append(thread.id)
+        if len(thread_ids) == LIST_PAGE_SIZE:
+            break
+    return thread_ids
+
+
+async def main() -> int:
+    if not FOUNDRY_ENDPOINT:
+        print("Error: FOUNDRY_ENDPOINT not set in .env")
+        return 1
+
+    print(f"Connecting to: {FOUNDRY_ENDPOINT}")
+
+    async with DefaultAzureCredential() as credential, AgentsClient(
+        endpoint=FOUNDRY_ENDPOINT,
+        credential=credential,
+    ) as client:
+        deleted = 0
+        # Threads that failed to delete; skipped so later rounds make progress
+        failed: set[str] = set()
+
+        async def worker(queue: asyncio.Queue[Optional[str]]) -> None:
+            """Delete queued threads until the None sentinel."""
+            nonlocal deleted
+            while (thread_id := await queue.get()) is not None:
+                try:
+                    await client.threads.delete(thread_id)
+                except Exception as e:
+                    failed.add(thread_id)
+                    print(f"[ERROR] Failed to delete {thread_id}: {e}")
+                else:
+                    deleted += 1
+                    print(f"[{deleted}] Deleted: {thread_id}")
+
+        print("Fetching and deleting threads...")
+        # Deleting while a paginated listing is in progress can invalidate its
+        # cursor, so each round lists a page first, deletes it, then lists again
+        # from the start until nothing is left
+        while thread_ids := await list_thread_ids(client, failed):
+            queue: asyncio.Queue[Optional[str]] = asyncio.Queue()
+            for thread_id in thread_ids:
+                queue.put_nowait(thread_id)
+            workers = min(MAX_CONCURRENT_DELETES, len(thread_ids))
+            for _ in range(workers):
+                queue.put_nowait(None)
+            await asyncio.gather(*(worker(queue) for _ in range(workers)))
+
+    errors = len(failed)
+    if deleted == 0 and errors == 0:
+        print("No threads found. Nothing to clean up.")
+        return 0
+
+    print("\nCleanup complete!")
+    print(f"  Deleted: {deleted}")
+    print(f"  Errors:  {errors}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -3,16 +3,66 @@ Pytest configuration and fixtures for voice avatar backend tests.
 """
 
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.voice_live import VoiceAvatarSession
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(app)
+    """Create one test client for the FastAPI app, running its lifespan once."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+# Session config defaults shared by the settings mock fixtures
+_DEFAULT_SETTINGS = dict(
+    VOICE_NAME="en-US-JennyNeural",
+    TURN_BASED_MODE=False,
+    ASSISTANT_INSTRUCTIONS="You are a helpful assistant.",
+    AVATAR_CHARACTER="lisa",
+    AVATAR_STYLE="casual-sitting",
+    AVATAR_CUSTOMIZED=False,
+    AVATAR_BASE_MODEL=None,  # Video avatar
+    AVATAR_VIDEO_BITRATE=2_000_000,
+    INPUT_LANGUAGES="en",
+    MAX_RESPONSE_TOKENS=4096,
+    VAD_THRESHOLD=0.5,
+    VAD_PREFIX_PADDING_MS=300,
+    VAD_SILENCE_DURATION_MS=500,
+    VAD_REMOVE_FILLER_WORDS=False,
+    EOU_THRESHOLD_LEVEL="medium",
+    EOU_TIMEOUT_MS=1000,
+    NOISE_REDUCTION_TYPE="azure_deep_noise_suppression",
+)
+
+
+@pytest.fixture(scope="module")
+def shared_settings_mock():
+    """Create one settings mock per module, preloaded with session config defaults.
+
+    Tests override individual attributes with monkeypatch so changes are undone
+    before the next test reuses the mock.
+    """
+    settings_mock = MagicMock()
+    for name, value in _DEFAULT_SETTINGS.items():
+        setattr(settings_mock, name, value)
+    return settings_mock
+
+
+@pytest.fixture
+def patch_settings(shared_settings_mock, monkeypatch):
+    """Return a helper that installs the shared settings mock with overrides."""
+
+    def apply(**overrides):
+        for name, value in overrides.items():
+            monkeypatch.setattr(shared_settings_mock, name, value)
+        monkeypatch.setattr("app.voice_live.settings", shared_settings_mock)
+        return shared_settings_mock
+
+    return apply
 
 
 @pytest.fixture
@@ -29,6 +79,15 @@ def mock_azure_connection():
     return connection
 
 
+@pytest.fixture
+def ready_session(mock_azure_connection):
+    """Create a VoiceAvatarSession wired to the mock connection and marked ready."""
+    session = VoiceAvatarSession()
+    session.connection = mock_azure_connection
+    session._set_session_ready()
+    return session
+
+
 @pytest.fixture
 def mock_voice_avatar_session(mock_azure_connection):
     """Create a mock VoiceAvatarSession with pre-configured connection."""
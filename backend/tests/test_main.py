@@ -41,6 +41,12 @@ class TestValidateBase64Data:
         assert is_valid is False
         assert "Invalid base64" in error
 
+    def test_invalid_base64_padding(self):
+        """Base64 with a length that is not a multiple of 4 should fail validation."""
+        is_valid, error = validate_base64_data("dGVzdA", MAX_AUDIO_CHUNK_SIZE)
+        assert is_valid is False
+        assert "Invalid base64" in error
+
     def test_sdp_size_limit(self):
         """SDP should respect its own size limit."""
         large_sdp = "v=0" + "A" * MAX_SDP_SIZE
@@ -66,13 +72,14 @@ class TestRateLimiter:
 
     def test_window_expiry(self):
         """Messages should be allowed again after window expires."""
-        import time
-
-        limiter = RateLimiter(max_messages=2, window_seconds=0.1)
+        clock = [1000.0]
+        limiter = RateLimiter(
+            max_messages=2, window_seconds=0.1, clock=lambda: clock[0]
+        )
         limiter.allow()
         limiter.allow()
         assert limiter.allow() is False
-        time.sleep(0.15)  # Wait for window to expire
+        clock[0] += 0.15  # Advance past the window instead of sleeping
         assert limiter.allow() is True
 
 
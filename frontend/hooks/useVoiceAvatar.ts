@@ -5,7 +5,12 @@ import {
   SAMPLE_RATE,
   CHANNELS,
   decodeBase64ToPCM16,
+  decodePCM16Frame,
+  BINARY_FRAME_AUDIO,
+  WS_SUBPROTOCOL,
   encodePCM16ToBase64,
+  encodePCM16Frame,
+  floatToPCM16,
   createAudioBuffer,
 } from "@/lib/audio-utils";
 
@@ -251,8 +256,8 @@ export function useVoiceAvatar(options: UseVoiceAvatarOptions = {}) {
     avatarSdpSentRef.current = false;
   }, []);
 
-  // Play audio from base64 PCM16 data (voice-only mode)
-  const playAudioChunk = useCallback(async (base64Data: string) => {
+  // Play decoded PCM16 audio (voice-only mode)
+  const playAudioChunk = useCallback(async (float32: Float32Array) => {
     try {
       // Create playback context if needed
       if (!playbackContextRef.current) {
@@ -262,8 +267,6 @@ export function useVoiceAvatar(options: UseVoiceAvatarOptions = {}) {
       }
       const ctx = playbackContextRef.current;
 
-      // Use utility functions for conversion
-      const float32 = decodeBase64ToPCM16(base64Data);
       const audioBuffer = createAudioBuffer(ctx, float32);
 
       // Queue and play
@@ -542,6 +545,11 @@ export function useVoiceAvatar(options: UseVoiceAvatarOptions = {}) {
           if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
             // Data comes as ArrayBuffer of Int16 values
             const int16Buffer = new Int16Array(event.data);
+            // Binary frames when the server negotiated the v2 subprotocol
+            if (wsRef.current.protocol === WS_SUBPROTOCOL) {
+              wsRef.current.send(encodePCM16Frame(int16Buffer));
+              return;
+            }
             // Convert Int16 to Float32 for encoding utility
             const float32 = new Float32Array(int16Buffer.length);
             for (let i = 0; i < int16Buffer.length; i++) {
@@ -574,6 +582,10 @@ export function useVoiceAvatar(options: UseVoiceAvatarOptions = {}) {
         processor.onaudioprocess = (e) => {
           if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
             const inputData = e.inputBuffer.getChannelData(0);
+            if (wsRef.current.protocol === WS_SUBPROTOCOL) {
+              wsRef.current.send(encodePCM16Frame(floatToPCM16(inputData)));
+              return;
+            }
             const base64 = encodePCM16ToBase64(inputData);
             wsRef.current.send(
               JSON.stringify({
@@ -600,6 +612,14 @@ export function useVoiceAvatar(options: UseVoiceAvatarOptions = {}) {
   const handleMessage = useCallback(
     async (event: MessageEvent) => {
       try {
+        // Binary frames carry raw PCM16 assistant audio (binary subprotocol)
+        if (event.data instanceof ArrayBuffer) {
+          if (new Uint8Array(event.data, 0, 1)[0] === BINARY_FRAME_AUDIO) {
+            playAudioChunk(decodePCM16Frame(event.data));
+          }
+          return;
+        }
+
         const data = JSON.parse(event.data);
         console.log("Received:", data.type);
 
@@ -704,7 +724,7 @@ export function useVoiceAvatar(options: UseVoiceAvatarOptions = {}) {
           case "audio.delta":
             // Play audio chunk (voice-only mode) - use type guard
             if (isAudioDeltaMessage(data) && data.data) {
-              playAudioChunk(data.data);
+              playAudioChunk(decodeBase64ToPCM16(data.data));
             }
             break;
 
@@ -827,7 +847,8 @@ export function useVoiceAvatar(options: UseVoiceAvatarOptions = {}) {
     reconnectAttemptsRef.current += 1;
 
     try {
-      const ws = new WebSocket(wsUrl);
+      const ws = new WebSocket(wsUrl, WS_SUBPROTOCOL);
+      ws.binaryType = "arraybuffer";
       wsRef.current = ws;
 
       ws.onopen = () => {
@@ -871,7 +892,8 @@ export function useVoiceAvatar(options: UseVoiceAvatarOptions = {}) {
     avatarSdpSentRef.current = false;
 
     try {
-      const ws = new WebSocket(wsUrl);
+      const ws = new WebSocket(wsUrl, WS_SUBPROTOCOL);
+      ws.binaryType = "arraybuffer";
       wsRef.current = ws;
 
       // Create a connection timeout promise
@@ -9,6 +9,12 @@
 export const SAMPLE_RATE = 24000;
 export const CHANNELS = 1;
 
+// WebSocket subprotocol for clients that send audio as binary frames
+export const WS_SUBPROTOCOL = "voice-avatar-v2";
+// Binary frame type byte for raw PCM16 audio, in both directions
+// (see backend BINARY_FRAME_AUDIO)
+export const BINARY_FRAME_AUDIO = 0x01;
+
 /**
  * Decode base64 PCM16 audio data to Float32Array.
  *
@@ -23,13 +29,31 @@ export function decodeBase64ToPCM16(base64Data: string): Float32Array {
     bytes[i] = binaryString.charCodeAt(i);
   }
 
-  // Convert PCM16 (Int16) to Float32 (-1.0 to 1.0 range)
-  const int16Array = new Int16Array(bytes.buffer);
-  const float32 = new Float32Array(int16Array.length);
-  for (let i = 0; i < int16Array.length; i++) {
-    float32[i] = int16Array[i] / 32768;
-  }
+  return pcm16ToFloat32(new Int16Array(bytes.buffer));
+}
+
+/**
+ * Decode a binary audio frame (type byte + raw PCM16) to Float32Array.
+ *
+ * @param frame - ArrayBuffer received as a binary WebSocket message
+ * @returns Float32Array suitable for AudioContext playback
+ */
+export function decodePCM16Frame(frame: ArrayBuffer): Float32Array {
+  // Copy past the type byte: Int16Array views need an even byte offset
+  return pcm16ToFloat32(new Int16Array(frame.slice(1)));
+}
 
+/**
+ * Convert PCM16 (Int16) samples to Float32 (-1.0 to 1.0 range).
+ *
+ * @param int16 - Int16Array of PCM16 samples
+ * @returns Float32Array suitable for AudioContext playback
+ */
+export function pcm16ToFloat32(int16: Int16Array): Float32Array {
+  const float32 = new Float32Array(int16.length);
+  for (let i = 0; i < int16.length; i++) {
+    float32[i] = int16[i] / 32768;
+  }
   return float32;
 }
 
@@ -41,12 +65,7 @@ export function decodeBase64ToPCM16(base64Data: string): Float32Array {
  */
 export function encodePCM16ToBase64(float32: Float32Array): string {
   // Convert Float32 to Int16 PCM
-  const int16 = new Int16Array(float32.length);
-  for (let i = 0; i < float32.length; i++) {
-    // Clamp to -1.0 to 1.0 range, then scale to Int16 range
-    const s = Math.max(-1, Math.min(1, float32[i]));
-    int16[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
-  }
+  const int16 = floatToPCM16(float32);
 
   // Convert to base64
   const bytes = new Uint8Array(int16.buffer);
@@ -58,6 +77,35 @@ export function encodePCM16ToBase64(float32: Float32Array): string {
   return btoa(binary);
 }
 
+/**
+ * Wrap Int16 PCM samples in a binary audio frame (type byte + raw PCM16).
+ *
+ * @param int16 - Int16Array of PCM16 samples
+ * @returns ArrayBuffer ready to send as a binary WebSocket message
+ */
+export function encodePCM16Frame(int16: Int16Array): ArrayBuffer {
+  const frame = new Uint8Array(1 + int16.byteLength);
+  frame[0] = BINARY_FRAME_AUDIO;
+  frame.set(new Uint8Array(int16.buffer, int16.byteOffset, int16.byteLength), 1);
+  return frame.buffer;
+}
+
+/**
+ * Convert Float32Array audio data to Int16 PCM.
+ *
+ * @param float32 - Float32Array from AudioContext (-1.0 to 1.0 range)
+ * @returns Int16Array of PCM16 samples
+ */
+export function floatToPCM16(float32: Float32Array): Int16Array {
+  const int16 = new Int16Array(float32.length);
+  for (let i = 0; i < float32.length; i++) {
+    // Clamp to -1.0 to 1.0 range, then scale to Int16 range
+    const s = Math.max(-1, Math.min(1, float32[i]));
+    int16[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
+  }
+  return int16;
+}
+
 /**
  * Create an AudioBuffer from Float32 PCM data.
  *